@@ -0,0 +1,185 @@
+"""
+The benchmarked hot paths. Imported by run.py after it has switched into the bot directory,
+since the cogs resolve their data folders relative to it.
+"""
+import asyncio
+import atexit
+import json
+import random
+import shutil
+import tempfile
+
+from stubs import StubClient, StubGuild, StubInteraction, StubUser
+
+# What a user has typed when an autocomplete fires
+AUTOCOMPLETE_QUERY = "ch"
+# Size of the stores written by the JSON store benchmarks
+STORE_RECORDS = 1000
+# Members in the guild used by member autocompletes
+GUILD_MEMBERS = 2000
+# User with a saved stats file in Data/, used by /moody
+MOODY_USER_ID = 307627785818603523
+
+
+class Benchmark:
+    def __init__(self, name: str, fn, is_async: bool = False, cwd: str = None):
+        self.name = name
+        self.fn = fn
+        self.is_async = is_async
+        # Directory to run in, for benchmarks that read or write relative paths
+        self.cwd = cwd
+
+    @property
+    def group(self) -> str:
+        return self.name.split("/", 1)[0]
+
+
+def _autocomplete(cog, callback, query: str = AUTOCOMPLETE_QUERY, **interaction_kwargs):
+    async def run():
+        return await callback(cog, StubInteraction(**interaction_kwargs), query)
+    return run
+
+
+def _store_round_trip(save, load, records):
+    def run():
+        save(records)
+        return load()
+    return run
+
+
+def build() -> list[Benchmark]:
+    from helpers import ParsedRollQuery
+    import data_loader
+    import pokemon_card
+    from commands import (ability, automate, gm_time, item, learns, legend_move, modmail, moody, move, open_box,
+                          quest_reminder, remind, rule, stats, timestamp, typechart, warn, weather)
+
+    client = StubClient()
+    guild = StubGuild(member_count=GUILD_MEMBERS)
+    benchmarks = []
+
+    # --- movelist lookups and move merging -----------------------------------------------------
+    moves_cog = learns.MovesCog(client)
+    with open(learns.find_movelist_filename("charizard"), "r", encoding="utf-8") as f:
+        charizard = json.load(f)
+    benchmarks += [
+        Benchmark("lookup/find_movelist_filename exact", lambda: learns.find_movelist_filename("pikachu")),
+        Benchmark("lookup/find_movelist_filename fuzzy", lambda: learns.find_movelist_filename("aegislash-blade")),
+        Benchmark("lookup/find_movelist_filename miss", lambda: learns.find_movelist_filename("missingno")),
+        Benchmark("merge/learns combine_moves", lambda: moves_cog.combine_moves(charizard, ["charmander", "charmeleon"])),
+        Benchmark("merge/stats combine_moves",
+                  lambda: pokemon_card.combine_moves(pokemon_card.normalize_keys(charizard), ["charmander", "charmeleon"])),
+        Benchmark("merge/stats build_learn_moves_layout", lambda: pokemon_card.build_learn_moves_layout("charizard")),
+    ]
+
+    # --- every autocomplete ----------------------------------------------------------------------
+    cogs = {
+        "ability": (ability.AbilityCommand(client), ability.AbilityCommand.autocomplete_ability),
+        "item": (item.ItemCommand(client), item.ItemCommand.autocomplete_item),
+        "rule": (rule.RulesCommand(client), rule.RulesCommand.autocomplete_rule),
+        "weather": (weather.WeatherCommand(client), weather.WeatherCommand.autocomplete_weather),
+        "move": (move.MoveCommand(client), move.MoveCommand.move_name_autocomplete),
+        "legend_move": (legend_move.LegendMoveCommand(client), legend_move.LegendMoveCommand.move_name_autocomplete),
+        "learns": (moves_cog, learns.MovesCog.pokemon_autocomplete),
+        "pokemon": (stats.StatsCog(client), stats.StatsCog.pokemon_autocomplete),
+        "typechart": (typechart.TypeInteractionsCog(client), typechart.TypeInteractionsCog.type1_autocomplete),
+        "open_box": (open_box.LootBox(client), open_box.LootBox.lockbox_autocomplete),
+        "automate_rolls": (automate.AutomateRoll(client), automate.AutomateRoll.crit_die_autocomplete),
+    }
+    for name, (cog, callback) in cogs.items():
+        benchmarks.append(Benchmark(f"autocomplete/{name}", _autocomplete(cog, callback), is_async=True))
+    benchmarks.append(Benchmark(
+        "autocomplete/moody", _autocomplete(moody.Moody(client), moody.Moody.autocomplete_pokemon_name,
+                                            "", user=StubUser(MOODY_USER_ID)), is_async=True
+    ))
+
+    # --- dice and loot ---------------------------------------------------------------------------
+    loot = cogs["open_box"][0]
+    benchmarks += [
+        Benchmark("dice/ParsedRollQuery 3d6+2", lambda: ParsedRollQuery.from_query("3d6+2").execute()),
+        Benchmark("dice/ParsedRollQuery 100d6", lambda: ParsedRollQuery.from_query("100d6").execute()),
+    ]
+    for box_type in loot.lock_boxes:
+        benchmarks.append(Benchmark(f"loot/{box_type}", lambda box_type=box_type: loot.roll_item(loot.roll_category(box_type)[1])))
+
+    # --- rendering -------------------------------------------------------------------------------
+    chart_cog = cogs["typechart"][0]
+
+    async def render_typechart():
+        await typechart.TypeInteractionsCog.typechart.callback(chart_cog, StubInteraction(), "Fire", "Flying")
+    benchmarks.append(Benchmark("render/typechart fire flying", render_typechart, is_async=True))
+
+    # --- data_loader -----------------------------------------------------------------------------
+    benchmarks.append(Benchmark("data/load_pokemon_data", lambda: data_loader.load_pokemon_data("Pikachu")))
+
+    # --- JSON stores, written to a scratch directory ----------------------------------------------
+    store_dir = tempfile.mkdtemp(prefix="pokemonrpbot-bench-")
+    atexit.register(shutil.rmtree, store_dir, True)
+    rng = random.Random(0)
+    user_ids = [str(rng.randrange(10 ** 17, 10 ** 18)) for _ in range(STORE_RECORDS)]
+
+    reminders = [
+        {"user_id": int(uid), "channel_id": 1, "message_id": i, "message": "Check the quest board",
+         "remind_time": "2030-01-01T00:00:00"}
+        for i, uid in enumerate(user_ids)
+    ]
+    offsets = {uid: [rng.randrange(-12, 13), rng.choice((0, 30))] for uid in user_ids}
+    gm_profiles = {uid: {"time": 12.5, "exp": 1250, "poke": 2812, "credits": 1250} for uid in user_ids}
+    warnings = {uid: [{"type": "Warning", "timestamp": "2030-01-01T00:00:00"}] for uid in user_ids}
+    mod_mail = {
+        str(i): {"guild_id": guild.id, "description": "Report text " * 10, "anonymous": False, "claimed": False,
+                 "claimer_id": None, "messages": [{"mod_id": 1, "channel_id": 2, "message_id": 3}] * 5}
+        for i in range(STORE_RECORDS)
+    }
+
+    # Built with __new__ so no loops start and nothing is read from the real data files
+    quest_cog = quest_reminder.ReminderCog.__new__(quest_reminder.ReminderCog)
+    quest_cog.bot = None
+    warn_cog = warn.WarningCog.__new__(warn.WarningCog)
+    warn_cog.warnings_file = "warnings.json"
+    mail_cog = modmail.ModMail.__new__(modmail.ModMail)
+    gm_cog = gm_time.GMTime.__new__(gm_time.GMTime)
+    gm_cog.lock = asyncio.Lock()
+    gm_cog.data = gm_profiles
+    gm_cog.weeks, gm_cog.months, gm_cog.recent, gm_cog.ledger_offset = {}, {}, {}, 0
+
+    def quest_round_trip():
+        quest_cog.reminders = reminders
+        quest_cog._save_reminders()
+        quest_cog._load_reminders()
+
+    def warnings_round_trip():
+        warn_cog.user_warnings = warnings
+        warn_cog.save_warnings()
+        return warn_cog.load_warnings()
+
+    async def gm_time_save():
+        gm_cog.DATA_DIR.mkdir(exist_ok=True)
+        await gm_cog._save_data()
+
+    def gm_time_entry():
+        gm_cog.DATA_DIR.mkdir(exist_ok=True)
+        gm_cog._record(user_ids[0], "gm_time", time=2.5, exp=10, poke=563, credits=250)
+
+    async def mod_mail_claim_save():
+        # A claim rewrites only the claimed record
+        mail_cog.mod_mail_records = mod_mail
+        await mail_cog.save_mod_mail_record("0")
+
+    benchmarks += [
+        Benchmark("stores/reminders", _store_round_trip(remind.save_reminders, remind.load_reminders, reminders), cwd=store_dir),
+        Benchmark("stores/user_offsets", _store_round_trip(timestamp.save_offsets, timestamp.load_offsets, offsets), cwd=store_dir),
+        Benchmark("stores/quest_reminders", quest_round_trip, cwd=store_dir),
+        Benchmark("stores/warnings", warnings_round_trip, cwd=store_dir),
+        Benchmark("stores/gm_time save", gm_time_save, is_async=True, cwd=store_dir),
+        Benchmark("stores/gm_time entry", gm_time_entry, cwd=store_dir),
+        Benchmark("stores/mod_mail_record claim", mod_mail_claim_save, is_async=True, cwd=store_dir),
+    ]
+
+    # gm_time's member autocomplete searches the guild's members
+    benchmarks.append(Benchmark(
+        "autocomplete/gm_stats member",
+        _autocomplete(None, gm_time.GMTime.user_autocomplete, "member 19", guild=guild),
+        is_async=True,
+    ))
+    return benchmarks
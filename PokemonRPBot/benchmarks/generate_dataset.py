@@ -0,0 +1,329 @@
+"""
+Builds scaled-up synthetic copies of Data/ so we can see how lookups, autocompletes and merges
+behave before the real data (and fan-game packs like Data/secret/insurgence) grows that large.
+
+    python benchmarks/generate_dataset.py 1 10 100   # benchmarks/datasets/1x, 10x and 100x
+    python benchmarks/run.py --dataset 10x           # benchmark against one of them
+
+A dataset at N times the current size keeps every real file and adds N-1 synthetic packs. A pack is
+the whole compendium with every Pokémon, move, ability and item renamed, written in the same JSON
+and CSV formats as the template it came from. Names are mapped word by word, so a pack stays
+consistent with itself: its movelists reference its own moves and abilities, its evolution lines
+link its own Pokémon, and the CSV identifiers match the JSON names. At 1x a dataset is the current
+tree rebuilt through the same pipeline, which makes a baseline for the sandbox itself.
+
+Data/csv/pokemon_moves.csv isn't in the repo, so every dataset gets a generated one.
+Generation is deterministic for a given --seed. 100x is roughly 1.5 GB on disk.
+"""
+import argparse
+import csv
+import json
+import os
+import random
+import re
+import shutil
+import sys
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+BOT_DIR = os.path.dirname(BENCH_DIR)
+DATA_DIR = os.path.join(BOT_DIR, "Data")
+DATASET_DIR = os.path.join(BENCH_DIR, "datasets")
+
+# Folders of one JSON file per entity, and which kind of name each file is about
+JSON_FOLDERS = {
+    "movelists": "pokemon",
+    "moves": "move",
+    "abilities": "ability",
+    "items": "item",
+}
+EVOLUTIONS_FILE = "pokemon_evolutions.json"
+# Synthetic ids are the real id plus pack * ID_STRIDE, well clear of the highest real id (~10300)
+ID_STRIDE = 100_000
+# Generated pokemon_moves.csv rows per Pokémon, spread over the learn methods below
+MOVES_PER_POKEMON = 60
+# pokemon_move_methods.csv id -> weight
+MOVE_METHOD_WEIGHTS = {"1": 4, "2": 1, "3": 1, "4": 4}
+VERSION_GROUP_ID = 20
+
+SYLLABLES = (
+    "ka", "zu", "ro", "mi", "ther", "vex", "lo", "dra", "pho", "gle", "nix", "tor", "bel", "quo", "sa",
+    "fen", "grim", "u", "an", "os", "ly", "pa", "cru", "esh", "vol", "ti", "mar", "on", "ze", "bri",
+)
+WORD = re.compile(r"[A-Za-z]+")
+
+
+class Renamer:
+    """
+    Maps real words to made-up ones, per pack and per kind of name. Every made-up word is unique
+    for its kind across all packs and never a real word, so synthetic names never collide with
+    each other or with the real data.
+    """
+
+    def __init__(self, seed: int):
+        self.seed = seed
+        self.words = {}  # (kind, pack, real word) -> made-up word
+        self.used = {}   # kind -> made-up words handed out so far, plus the real words
+
+    def reserve(self, kind: str, names):
+        used = self.used.setdefault(kind, set())
+        for name in names:
+            used.update(word.lower() for word in WORD.findall(name))
+
+    def word(self, kind: str, pack: int, real: str) -> str:
+        key = (kind, pack, real.lower())
+        if key not in self.words:
+            rng = random.Random(f"{self.seed}:{kind}:{pack}:{real.lower()}")
+            used = self.used.setdefault(kind, set())
+            syllables = min(4, max(1, round(len(real) / 3)))
+            made_up, attempts = "", 0
+            while not made_up or made_up in used:
+                # Short names run out quickly at 100x, so lengthen after a few collisions
+                made_up = "".join(rng.choice(SYLLABLES) for _ in range(syllables + attempts // 5))
+                attempts += 1
+            used.add(made_up)
+            self.words[key] = made_up
+        made_up = self.words[key]
+        if real.isupper() and len(real) > 1:
+            return made_up.upper()
+        return made_up.title() if real[0].isupper() else made_up
+
+    def name(self, kind: str, pack: int, real: str) -> str:
+        """Rename every word of a name, keeping its punctuation and casing style."""
+        return WORD.sub(lambda match: self.word(kind, pack, match.group()), real)
+
+
+def json_indent(text: str) -> int:
+    lines = text.split("\n", 2)
+    return len(lines[1]) - len(lines[1].lstrip()) if len(lines) > 1 else 4
+
+
+def write_json(path: str, data, indent: int):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=indent, ensure_ascii=False)
+
+
+def rename_movelist(data: dict, renamer: Renamer, pack: int) -> dict:
+    data = dict(data)
+    data["name"] = renamer.name("pokemon", pack, data.get("name", ""))
+    data["number"] = data.get("number", 0) + pack * ID_STRIDE
+    data["abilities"] = {
+        slot: [renamer.name("ability", pack, ability) for ability in abilities]
+        for slot, abilities in data.get("abilities", {}).items()
+    }
+    data["moves"] = {
+        rank: [renamer.name("move", pack, move) for move in moves]
+        for rank, moves in data.get("moves", {}).items()
+    }
+    return data
+
+
+def rename_move(data: dict, renamer: Renamer, pack: int) -> dict:
+    data = dict(data)
+    data["Name"] = renamer.name("move", pack, data.get("Name", ""))
+    if "_id" in data:
+        data["_id"] = renamer.name("move", pack, data["_id"])
+    return data
+
+
+def rename_named(kind: str):
+    def rename(data: dict, renamer: Renamer, pack: int) -> dict:
+        data = dict(data)
+        data["name"] = renamer.name(kind, pack, data.get("name", ""))
+        return data
+    return rename
+
+
+RENAMERS = {
+    "movelists": rename_movelist,
+    "moves": rename_move,
+    "abilities": rename_named("ability"),
+    "items": rename_named("item"),
+}
+
+
+def scale_json_folder(folder: str, out_data: str, renamer: Renamer, packs: int) -> int:
+    source = os.path.join(DATA_DIR, folder)
+    target = os.path.join(out_data, folder)
+    os.makedirs(target, exist_ok=True)
+    kind = JSON_FOLDERS[folder]
+    written = 0
+    for filename in sorted(os.listdir(source)):
+        if not filename.endswith(".json"):
+            continue
+        with open(os.path.join(source, filename), "r", encoding="utf-8") as f:
+            text = f.read()
+        shutil.copyfile(os.path.join(source, filename), os.path.join(target, filename))
+        written += 1
+        try:
+            data = json.loads(text)
+        except json.JSONDecodeError:
+            continue
+        indent = json_indent(text)
+        stem = filename[:-5]
+        for pack in range(1, packs):
+            synthetic = RENAMERS[folder](data, renamer, pack)
+            write_json(os.path.join(target, f"{renamer.name(kind, pack, stem)}.json"), synthetic, indent)
+            written += 1
+    return written
+
+
+def scale_evolutions(out_data: str, renamer: Renamer, packs: int):
+    with open(os.path.join(DATA_DIR, EVOLUTIONS_FILE), "r", encoding="utf-8") as f:
+        evolutions = json.load(f)
+    scaled = dict(evolutions)
+    for pack in range(1, packs):
+        for pokemon, pre_evolutions in evolutions.items():
+            scaled[renamer.name("pokemon", pack, pokemon)] = [
+                renamer.name("pokemon", pack, pre) for pre in pre_evolutions
+            ]
+    with open(os.path.join(out_data, EVOLUTIONS_FILE), "w", encoding="utf-8") as f:
+        json.dump(scaled, f, indent=4)
+
+
+def read_csv(name: str) -> tuple[list[str], list[dict]]:
+    with open(os.path.join(DATA_DIR, "csv", name), "r", encoding="utf-8", newline="") as f:
+        reader = csv.DictReader(f)
+        return reader.fieldnames, list(reader)
+
+
+def write_csv(path: str, fieldnames: list[str], rows):
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames, lineterminator="\n")
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def offset_id(value: str, pack: int) -> str:
+    return str(int(value) + pack * ID_STRIDE) if value else value
+
+
+def scale_csv(out_data: str, renamer: Renamer, packs: int, seed: int):
+    target = os.path.join(out_data, "csv")
+    os.makedirs(target, exist_ok=True)
+    # (file, kind of identifier, columns holding ids that need offsetting)
+    tables = [
+        ("pokemon.csv", "pokemon", ("id", "species_id")),
+        ("pokemon_species.csv", "pokemon", ("id", "evolves_from_species_id", "evolution_chain_id")),
+        ("moves.csv", "move", ("id",)),
+    ]
+    scaled = {}
+    for filename, kind, id_columns in tables:
+        fieldnames, rows = read_csv(filename)
+        out_rows = list(rows)
+        for pack in range(1, packs):
+            for row in rows:
+                row = dict(row)
+                row["identifier"] = renamer.name(kind, pack, row["identifier"])
+                for column in id_columns:
+                    row[column] = offset_id(row[column], pack)
+                out_rows.append(row)
+        write_csv(os.path.join(target, filename), fieldnames, out_rows)
+        scaled[filename] = out_rows
+    shutil.copyfile(os.path.join(DATA_DIR, "csv", "pokemon_move_methods.csv"),
+                    os.path.join(target, "pokemon_move_methods.csv"))
+
+    # Each Pokémon learns moves from its own pack
+    rng = random.Random(seed)
+    move_ids = {}
+    for row in scaled["moves.csv"]:
+        move_ids.setdefault(int(row["id"]) // ID_STRIDE, []).append(row["id"])
+    methods, weights = zip(*MOVE_METHOD_WEIGHTS.items())
+
+    def pokemon_moves():
+        for row in scaled["pokemon.csv"]:
+            pack_moves = move_ids[int(row["id"]) // ID_STRIDE]
+            for order, move_id in enumerate(rng.sample(pack_moves, min(MOVES_PER_POKEMON, len(pack_moves))), 1):
+                method = rng.choices(methods, weights)[0]
+                yield {
+                    "pokemon_id": row["id"], "version_group_id": VERSION_GROUP_ID, "move_id": move_id,
+                    "pokemon_move_method_id": method, "level": rng.randint(1, 100) if method == "1" else 0,
+                    "order": order if method == "1" else "",
+                }
+
+    write_csv(os.path.join(target, "pokemon_moves.csv"),
+              ["pokemon_id", "version_group_id", "move_id", "pokemon_move_method_id", "level", "order"],
+              pokemon_moves())
+
+
+def copy_unscaled(out_data: str):
+    """Everything the generator doesn't scale is copied as is, so every command still has its data."""
+    skip = set(JSON_FOLDERS) | {EVOLUTIONS_FILE, "csv", "__pycache__"}
+    for entry in os.listdir(DATA_DIR):
+        if entry in skip or entry.endswith(".py"):
+            continue
+        source = os.path.join(DATA_DIR, entry)
+        if os.path.isdir(source):
+            shutil.copytree(source, os.path.join(out_data, entry), dirs_exist_ok=True,
+                            ignore=shutil.ignore_patterns("__pycache__", "*.py"))
+        else:
+            shutil.copyfile(source, os.path.join(out_data, entry))
+
+
+def generate(scale: int, seed: int = 0, out_dir: str = None) -> str:
+    """Writes the dataset for `scale` and returns its directory."""
+    if out_dir is None:
+        out_dir = os.path.join(DATASET_DIR, f"{scale}x")
+        os.makedirs(DATASET_DIR, exist_ok=True)
+        # Generated data never belongs in git
+        with open(os.path.join(DATASET_DIR, ".gitignore"), "w", encoding="utf-8") as f:
+            f.write("*\n")
+    out_data = os.path.join(out_dir, "Data")
+    if os.path.exists(out_data):
+        shutil.rmtree(out_data)
+    os.makedirs(out_data)
+
+    renamer = Renamer(seed)
+    for folder, kind in JSON_FOLDERS.items():
+        renamer.reserve(kind, (name[:-5] for name in os.listdir(os.path.join(DATA_DIR, folder))))
+    _, pokemon_rows = read_csv("pokemon.csv")
+    _, move_rows = read_csv("moves.csv")
+    renamer.reserve("pokemon", (row["identifier"] for row in pokemon_rows))
+    renamer.reserve("move", (row["identifier"] for row in move_rows))
+
+    for folder in JSON_FOLDERS:
+        count = scale_json_folder(folder, out_data, renamer, scale)
+        print(f"{scale}x {folder}: {count} files")
+    scale_evolutions(out_data, renamer, scale)
+    scale_csv(out_data, renamer, scale, seed)
+    copy_unscaled(out_data)
+    prepare_root(out_dir)
+    return out_dir
+
+
+def prepare_root(out_dir: str) -> str:
+    """
+    Makes a dataset directory runnable as a bot directory: copies in the current code (so each
+    benchmark run uses today's code, not the code from when the dataset was generated) and adds the
+    lowercase data/ alias some cogs use, on filesystems where case matters.
+    """
+    if not os.path.isdir(os.path.join(out_dir, "Data")):
+        raise FileNotFoundError(f"No dataset at {out_dir}, run benchmarks/generate_dataset.py first")
+    os.makedirs(os.path.join(out_dir, "commands"), exist_ok=True)
+    for folder in ("", "commands"):
+        for filename in os.listdir(os.path.join(BOT_DIR, folder)):
+            if filename.endswith(".py"):
+                shutil.copy2(os.path.join(BOT_DIR, folder, filename), os.path.join(out_dir, folder, filename))
+    if not os.path.exists(os.path.join(out_dir, "data")):
+        os.symlink("Data", os.path.join(out_dir, "data"), target_is_directory=True)
+    return out_dir
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("scales", type=int, nargs="*", default=[1, 10, 100], help="size multiples to generate")
+    parser.add_argument("--seed", type=int, default=0)
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    for scale in args.scales:
+        if scale < 1:
+            print(f"Scale must be at least 1, got {scale}")
+            return 1
+        print(f"Generated {generate(scale, args.seed)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,405 @@
+"""
+Replays a mix of slash commands, button clicks and autocomplete keystrokes against the real cogs,
+in-process, with a local stand-in for Discord's gateway and HTTP API (simulated latency and 429s).
+
+    python benchmarks/loadtest.py --sessions 50 --duration 30
+    python benchmarks/loadtest.py --mix recorded_mix.json --latency 120 --rate-limit 0.05
+
+Latency is measured per interaction from gateway dispatch to its first response, which is what
+Discord's 3 second deadline applies to. The mix file is a JSON list of entries like
+{"weight": 5, "type": "command", "name": "learns", "options": {"pokemon": "Charizard"}};
+see DEFAULT_MIX. The cogs run in a scratch working directory, so the JSON stores and logs they
+write (reminders.json, successive_debug.log, ...) never land in the bot directory.
+"""
+import argparse
+import asyncio
+import atexit
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+import discord
+from discord.ext import commands
+from discord.webhook import async_ as webhook_async
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+BOT_DIR = os.path.dirname(BENCH_DIR)
+
+APPLICATION_ID = 1
+GUILD_ID = 900000000000000001
+CHANNEL_ID = 900000000000000002
+# Discord fails an interaction that gets no response within this many seconds
+RESPONSE_DEADLINE = 3.0
+LOOP_LAG_INTERVAL = 0.05
+
+# Read-only commands, so replaying them never touches the JSON stores
+DEFAULT_MIX = [
+    {"weight": 10, "type": "command", "name": "r", "options": {"query": "3d6+2"}},
+    {"weight": 5, "type": "command", "name": "roll", "options": {"dice": 4}},
+    {"weight": 6, "type": "command", "name": "stats", "options": {"pokemon": "Charizard"}},
+    {"weight": 6, "type": "command", "name": "learns", "options": {"pokemon": "Charizard"}},
+    {"weight": 4, "type": "command", "name": "typechart", "options": {"type1": "Fire", "type2": "Flying"}},
+    {"weight": 4, "type": "command", "name": "move", "options": {"move": "Absorb"}},
+    {"weight": 3, "type": "command", "name": "ability", "options": {"name": "Adaptability"}},
+    {"weight": 3, "type": "command", "name": "item", "options": {"name": "Ability Patch"}},
+    {"weight": 3, "type": "command", "name": "open_box", "options": {"box_type": "Berry"}},
+    {"weight": 6, "type": "button", "custom_id": "pokemon:moves:charizard"},
+    {"weight": 4, "type": "button", "custom_id": "pokemon:abilities:charizard"},
+    {"weight": 3, "type": "button", "custom_id": "pokemon:learnmoves:charizard"},
+    {"weight": 8, "type": "autocomplete", "name": "learns", "option": "pokemon", "keystrokes": "chari"},
+    {"weight": 8, "type": "autocomplete", "name": "stats", "option": "pokemon", "keystrokes": "pika"},
+    {"weight": 4, "type": "autocomplete", "name": "move", "option": "move", "keystrokes": "thun"},
+]
+
+
+def snowflake() -> int:
+    # Random low bits keep concurrent ids unique within the same millisecond
+    return discord.utils.time_snowflake(discord.utils.utcnow()) + random.randrange(1 << 22)
+
+
+def user_payload(user_id: int) -> dict:
+    return {"id": str(user_id), "username": f"trainer{user_id % 10000}", "discriminator": "0",
+            "global_name": None, "avatar": None}
+
+
+class FakeDiscord:
+    """
+    Plays Discord's HTTP API: every request takes a simulated round trip, a share of them are
+    rate limited first (retried after retry_after, like discord.py does), and the first response to
+    each interaction resolves the future the load generator is waiting on.
+    """
+
+    def __init__(self, latency: float, jitter: float, rate_limit_chance: float, retry_after: float, rng: random.Random):
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_limit_chance = rate_limit_chance
+        self.retry_after = retry_after
+        self.rng = rng
+        self.requests = 0
+        self.rate_limited = 0
+        self.pending = {}  # interaction id -> future resolved on its first response
+        # custom_id -> the last message sent with that button, so clicks hit views bound to a message
+        self.messages_by_custom_id = {}
+
+    async def round_trip(self):
+        self.requests += 1
+        await asyncio.sleep(max(0.0, self.rng.gauss(self.latency, self.jitter)))
+        while self.rng.random() < self.rate_limit_chance:
+            self.rate_limited += 1
+            await asyncio.sleep(self.retry_after + max(0.0, self.rng.gauss(self.latency, self.jitter)))
+
+    def message(self, content=None) -> dict:
+        return {
+            "id": str(snowflake()), "channel_id": str(CHANNEL_ID), "author": user_payload(APPLICATION_ID),
+            "content": content or "", "timestamp": discord.utils.utcnow().isoformat(), "edited_timestamp": None,
+            "tts": False, "mention_everyone": False, "mentions": [], "mention_roles": [], "attachments": [],
+            "embeds": [], "pinned": False, "type": 0, "flags": 0, "components": [],
+        }
+
+    def sent(self, payload: dict) -> dict:
+        """A message as Discord would return it, remembering which buttons it carried."""
+        message = self.message(payload.get("content"))
+        rows = payload.get("components") or []
+        message["components"] = rows
+        for row in rows:
+            for component in row.get("components", []):
+                if "custom_id" in component:
+                    self.messages_by_custom_id[component["custom_id"]] = message
+        return message
+
+    def responded(self, interaction_id: int):
+        future = self.pending.get(interaction_id)
+        if future is not None and not future.done():
+            future.set_result(time.perf_counter())
+
+
+class FakeWebhookAdapter(webhook_async.AsyncWebhookAdapter):
+    """Interaction callbacks, followups and original-response edits all go through here."""
+
+    def __init__(self, fake: FakeDiscord):
+        super().__init__()
+        self.fake = fake
+
+    async def request(self, route, session=None, *, payload=None, multipart=None, proxy=None, proxy_auth=None,
+                      files=None, reason=None, auth_token=None, params=None):
+        await self.fake.round_trip()
+        if route.path.endswith("/callback"):
+            interaction_id = int(route.webhook_id)
+            self.fake.responded(interaction_id)
+            response = {"interaction": {"id": str(interaction_id), "type": 2}}
+            data = (payload or {}).get("data") or {}
+            if data.get("components"):
+                # Dynamic items are found through the clicked message's components, so keep those too
+                response["resource"] = {"type": payload["type"], "message": self.fake.sent(data)}
+            return response
+        return self.fake.sent(payload or {})
+
+
+def install_fake_http(bot: commands.Bot, fake: FakeDiscord):
+    """Route the bot's REST calls and interaction webhooks to the fake API."""
+    async def request(route, *, files=None, form=None, **kwargs):
+        await fake.round_trip()
+        if route.method == "POST" and route.path.endswith("/messages"):
+            return fake.message()
+        return {}
+
+    bot.http.request = request
+    webhook_async.async_context.set(FakeWebhookAdapter(fake))
+
+
+class InteractionFactory:
+    """Builds INTERACTION_CREATE payloads from mix entries, resolving command ids and option types."""
+
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+
+    def _base(self, interaction_type: int, user_id: int, data: dict) -> dict:
+        return {
+            "id": str(snowflake()), "application_id": str(APPLICATION_ID), "type": interaction_type,
+            "token": "loadtest", "version": 1, "guild_id": str(GUILD_ID), "channel_id": str(CHANNEL_ID),
+            "member": {"user": user_payload(user_id), "roles": [], "joined_at": "2024-01-01T00:00:00+00:00",
+                       "deaf": False, "mute": False, "flags": 0, "permissions": "0"},
+            "locale": "en-US", "app_permissions": "0", "entitlements": [], "attachment_size_limit": 10 * 1024 * 1024,
+            "data": data,
+        }
+
+    def _options(self, name: str, values: dict, focused: str = None) -> list:
+        command = self.bot.tree.get_command(name)
+        if command is None:
+            raise KeyError(f"/{name} is not loaded")
+        types = {parameter.name: parameter.type.value for parameter in command.parameters}
+        return [
+            {"name": option, "type": types.get(option, 3), "value": value, **({"focused": True} if option == focused else {})}
+            for option, value in values.items()
+        ]
+
+    def command(self, entry: dict, user_id: int) -> dict:
+        data = {"id": str(APPLICATION_ID), "name": entry["name"], "type": 1,
+                "options": self._options(entry["name"], entry.get("options", {}))}
+        return self._base(2, user_id, data)
+
+    def autocomplete(self, entry: dict, user_id: int, typed: str) -> dict:
+        data = {"id": str(APPLICATION_ID), "name": entry["name"], "type": 1,
+                "options": self._options(entry["name"], {entry["option"]: typed}, focused=entry["option"])}
+        return self._base(4, user_id, data)
+
+    def button(self, entry: dict, user_id: int, message: dict) -> dict:
+        payload = self._base(3, user_id, {"custom_id": entry["custom_id"], "component_type": 2})
+        payload["message"] = message
+        return payload
+
+
+class LoadTest:
+    def __init__(self, bot: commands.Bot, fake: FakeDiscord, mix: list, rng: random.Random, think_time: float):
+        self.bot = bot
+        self.fake = fake
+        self.mix = mix
+        self.weights = [entry.get("weight", 1) for entry in mix]
+        self.rng = rng
+        self.think_time = think_time
+        self.factory = InteractionFactory(bot)
+        self.latencies = {}  # mix entry label -> [seconds]
+        self.missed = {}     # mix entry label -> interactions with no response within RESPONSE_DEADLINE
+        self.errors = {}
+        self.loop_lag = []
+
+    async def dispatch(self, label: str, payload: dict):
+        """Feed one payload through the gateway handler and wait for its first response."""
+        interaction_id = int(payload["id"])
+        future = asyncio.get_running_loop().create_future()
+        self.fake.pending[interaction_id] = future
+        start = time.perf_counter()
+        self.bot._connection.parse_interaction_create(payload)
+        try:
+            responded_at = await asyncio.wait_for(asyncio.shield(future), RESPONSE_DEADLINE)
+            self.latencies.setdefault(label, []).append(responded_at - start)
+        except asyncio.TimeoutError:
+            self.missed[label] = self.missed.get(label, 0) + 1
+        finally:
+            self.fake.pending.pop(interaction_id, None)
+
+    async def run_entry(self, entry: dict, user_id: int):
+        kind = entry["type"]
+        if kind == "command":
+            await self.dispatch(f"/{entry['name']}", self.factory.command(entry, user_id))
+        elif kind == "autocomplete":
+            # One request per keystroke, as Discord sends them while the user types
+            for i in range(1, len(entry["keystrokes"]) + 1):
+                payload = self.factory.autocomplete(entry, user_id, entry["keystrokes"][:i])
+                await self.dispatch(f"/{entry['name']} {entry['option']} autocomplete", payload)
+                await asyncio.sleep(self.rng.uniform(0.05, 0.2))
+        elif kind == "button":
+            message = self.fake.messages_by_custom_id.get(entry["custom_id"]) or self.fake.message()
+            await self.dispatch(f"button {entry['custom_id'].rsplit(':', 1)[0]}",
+                                self.factory.button(entry, user_id, message))
+        else:
+            raise ValueError(f"Unknown mix entry type: {kind}")
+
+    async def session(self, user_id: int, deadline: float):
+        """One simulated RP participant: pick an interaction, wait for it, think, repeat."""
+        while time.perf_counter() < deadline:
+            entry = self.rng.choices(self.mix, self.weights)[0]
+            try:
+                await self.run_entry(entry, user_id)
+            except Exception as e:
+                key = f"{type(e).__name__}: {e}"
+                self.errors[key] = self.errors.get(key, 0) + 1
+            await asyncio.sleep(self.rng.expovariate(1 / self.think_time) if self.think_time else 0)
+
+    async def monitor_loop_lag(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + LOOP_LAG_INTERVAL
+            await asyncio.sleep(LOOP_LAG_INTERVAL)
+            self.loop_lag.append(max(0.0, loop.time() - expected))
+
+    async def warm_up(self):
+        """
+        Run every command, then every button, in the mix once, uncounted: fills the caches a live bot
+        would have warm, and sends the messages whose buttons the button entries click.
+        """
+        for kind in ("command", "button"):
+            for entry in self.mix:
+                if entry["type"] == kind:
+                    await self.run_entry(entry, 1)
+        self.latencies.clear()
+        self.missed.clear()
+        self.fake.requests = self.fake.rate_limited = 0
+
+    async def run(self, sessions: int, duration: float) -> float:
+        monitor = asyncio.create_task(self.monitor_loop_lag())
+        start = time.perf_counter()
+        deadline = start + duration
+        await asyncio.gather(*(self.session(10_000 + i, deadline) for i in range(sessions)))
+        monitor.cancel()
+        return time.perf_counter() - start
+
+
+def percentile(values: list, q: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+def report(test: LoadTest, fake: FakeDiscord, elapsed: float, sessions: int) -> str:
+    all_latencies = [value for values in test.latencies.values() for value in values]
+    missed = sum(test.missed.values())
+    total = len(all_latencies) + missed
+    lines = [
+        f"{sessions} sessions for {elapsed:.1f}s: {total} interactions, {total / elapsed:.1f}/s",
+        f"first response p50={percentile(all_latencies, 0.5) * 1000:.0f}ms "
+        f"p99={percentile(all_latencies, 0.99) * 1000:.0f}ms, "
+        f"missed the {RESPONSE_DEADLINE:.0f}s deadline: {missed}",
+        f"event loop lag p50={percentile(test.loop_lag, 0.5) * 1000:.1f}ms "
+        f"p99={percentile(test.loop_lag, 0.99) * 1000:.1f}ms max={max(test.loop_lag, default=0) * 1000:.1f}ms",
+        f"HTTP requests: {fake.requests}, rate limited: {fake.rate_limited}",
+        "",
+        f"{'interaction':<40} {'count':>6} {'missed':>6} {'p50 ms':>8} {'p99 ms':>8}",
+    ]
+    labels = set(test.latencies) | set(test.missed)
+    for label in sorted(labels, key=lambda label: percentile(test.latencies.get(label, []), 0.99), reverse=True):
+        values = test.latencies.get(label, [])
+        lines.append(f"{label:<40} {len(values):>6} {test.missed.get(label, 0):>6} "
+                     f"{percentile(values, 0.5) * 1000:>8.0f} {percentile(values, 0.99) * 1000:>8.0f}")
+    for error, count in test.errors.items():
+        lines.append(f"error x{count}: {error}")
+    return "\n".join(lines)
+
+
+def scratch_dir(root: str) -> str:
+    """
+    A working directory for the cogs: Data's folders are linked, its top-level files copied (those are
+    the ones the cogs write), and the lowercase data/ alias points at the same place.
+    """
+    workdir = tempfile.mkdtemp(prefix="pokemonrpbot-loadtest-")
+    data = os.path.join(workdir, "Data")
+    os.mkdir(data)
+    for name in os.listdir(os.path.join(root, "Data")):
+        source = os.path.join(root, "Data", name)
+        if os.path.isdir(source):
+            os.symlink(source, os.path.join(data, name), target_is_directory=True)
+        else:
+            shutil.copy2(source, os.path.join(data, name))
+    os.symlink("Data", os.path.join(workdir, "data"), target_is_directory=True)
+    return workdir
+
+
+async def start_bot(instrument: bool) -> commands.Bot:
+    import config
+
+    intents = discord.Intents.default()
+    intents.message_content = True
+    intents.members = True
+    bot = commands.Bot(command_prefix="!", intents=intents)
+    # Sets up the ready event without logging in; it never fires, so the cogs' background loops stay parked
+    await bot._async_setup_hook()
+    bot._connection.application_id = APPLICATION_ID
+    bot._connection.user = discord.ClientUser(state=bot._connection, data=user_payload(APPLICATION_ID))
+    if instrument:
+        import deferral_guard
+        import metrics
+        metrics.instrument()
+        deferral_guard.install()
+
+    for extension in config.COMMANDS:
+        try:
+            await bot.load_extension(extension)
+        except Exception as e:
+            print(f"Skipping {extension}: {e}")
+    return bot
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--root", default=BOT_DIR, help="bot directory to load the cogs from")
+    parser.add_argument("--mix", help="JSON file with the interaction mix (default: built-in synthetic mix)")
+    parser.add_argument("--sessions", type=int, default=20, help="concurrent simulated users")
+    parser.add_argument("--duration", type=float, default=20, help="seconds to run")
+    parser.add_argument("--think-time", type=float, default=1.0, help="mean seconds between a user's interactions")
+    parser.add_argument("--latency", type=float, default=80, help="mean simulated API round trip in ms")
+    parser.add_argument("--jitter", type=float, default=30, help="round trip standard deviation in ms")
+    parser.add_argument("--rate-limit", type=float, default=0.02, help="chance a request is answered with a 429 first")
+    parser.add_argument("--retry-after", type=float, default=0.5, help="seconds a simulated 429 asks us to wait")
+    parser.add_argument("--instrument", action="store_true", help="install metrics and the deferral guard like bot.py")
+    parser.add_argument("--seed", type=int, default=0)
+    return parser.parse_args(argv)
+
+
+async def main(argv=None):
+    args = parse_args(argv)
+    root = os.path.abspath(args.root)
+    workdir = scratch_dir(root)
+    # rmtree unlinks the Data folder links without following them
+    atexit.register(shutil.rmtree, workdir, True)
+    os.chdir(workdir)
+    sys.path.insert(0, root)
+
+    mix = DEFAULT_MIX
+    if args.mix:
+        with open(args.mix, "r", encoding="utf-8") as f:
+            mix = json.load(f)
+
+    rng = random.Random(args.seed)
+    fake = FakeDiscord(args.latency / 1000, args.jitter / 1000, args.rate_limit, args.retry_after, rng)
+    install_fake_http(bot := await start_bot(args.instrument), fake)
+
+    test = LoadTest(bot, fake, mix, rng, args.think_time)
+    # The cogs print on every lookup; only the report should reach the terminal
+    stdout = sys.stdout
+    with open(os.devnull, "w") as quiet:
+        sys.stdout = quiet
+        try:
+            await test.warm_up()
+            elapsed = await test.run(args.sessions, args.duration)
+        finally:
+            sys.stdout = stdout
+    print(report(test, fake, elapsed, args.sessions))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,185 @@
+"""
+Offline benchmarks for the bot's hot paths, no Discord connection needed.
+
+    python benchmarks/run.py                      # compare against benchmarks/baselines/default.json
+    python benchmarks/run.py --save-baseline      # record the current timings as the baseline
+    python benchmarks/run.py --only autocomplete  # run a subset
+    python benchmarks/run.py --dataset 10x        # run against a generated dataset (see generate_dataset.py)
+
+Exits with status 1 when a benchmark got slower than its baseline by more than its threshold.
+Timings depend on the machine, so record a baseline on the machine you compare on.
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+BOT_DIR = os.path.dirname(BENCH_DIR)
+BASELINE_DIR = os.path.join(BENCH_DIR, "baselines")
+
+# Allowed slowdown before a benchmark counts as a regression (0.25 = 25% slower)
+DEFAULT_THRESHOLD = 0.25
+# Disk-bound groups are noisier, so they get more room
+GROUP_THRESHOLDS = {
+    "stores": 0.5,
+    "lookup": 0.4,
+}
+ROUNDS = 5
+# Each round repeats the call until it takes at least this long
+MIN_ROUND_TIME = 0.05
+MAX_CALLS_PER_ROUND = 100_000
+
+
+def time_calls(benchmark, calls: int, loop: asyncio.AbstractEventLoop) -> float:
+    if benchmark.is_async:
+        async def batch():
+            start = time.perf_counter()
+            for _ in range(calls):
+                await benchmark.fn()
+            return time.perf_counter() - start
+        return loop.run_until_complete(batch())
+
+    start = time.perf_counter()
+    for _ in range(calls):
+        benchmark.fn()
+    return time.perf_counter() - start
+
+
+def measure(benchmark, loop: asyncio.AbstractEventLoop) -> float:
+    """Median seconds per call over ROUNDS rounds, after a warm-up call."""
+    time_calls(benchmark, 1, loop)
+    calls = 1
+    while calls < MAX_CALLS_PER_ROUND and time_calls(benchmark, calls, loop) < MIN_ROUND_TIME:
+        calls *= 2
+    return statistics.median(time_calls(benchmark, calls, loop) / calls for _ in range(ROUNDS))
+
+
+def format_seconds(seconds: float) -> str:
+    if seconds >= 1:
+        return f"{seconds:.2f} s"
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.2f} ms"
+    return f"{seconds * 1e6:.1f} us"
+
+
+def baseline_path(name: str) -> str:
+    return os.path.join(BASELINE_DIR, f"{name}.json")
+
+
+def load_baseline(name: str) -> dict:
+    try:
+        with open(baseline_path(name), "r", encoding="utf-8") as f:
+            return json.load(f).get("results", {})
+    except FileNotFoundError:
+        return {}
+
+
+def save_baseline(name: str, results: dict):
+    os.makedirs(BASELINE_DIR, exist_ok=True)
+    with open(baseline_path(name), "w", encoding="utf-8") as f:
+        json.dump({
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "results": results,
+        }, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def compare(benchmark, seconds: float, baseline: dict) -> tuple[str, bool]:
+    """Status column text, and whether it's a regression."""
+    previous = baseline.get(benchmark.name)
+    if previous is None:
+        return "new", False
+    threshold = GROUP_THRESHOLDS.get(benchmark.group, DEFAULT_THRESHOLD)
+    change = seconds / previous - 1
+    if change > threshold:
+        return f"REGRESSED {change:+.0%} (limit +{threshold:.0%})", True
+    return f"{change:+.0%}", False
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--root", default=BOT_DIR, help="bot directory to benchmark (default: this checkout)")
+    parser.add_argument("--dataset", help="generated dataset in benchmarks/datasets/ to run against, e.g. 10x")
+    parser.add_argument("--baseline", help="baseline name in benchmarks/baselines/ (default: the dataset name, or default)")
+    parser.add_argument("--save-baseline", action="store_true", help="store the results as the baseline")
+    parser.add_argument("--only", help="only run benchmarks whose name contains this text")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    baseline_name = args.baseline or args.dataset or "default"
+
+    # The cogs read their data relative to the bot directory, like the running bot does
+    root = os.path.abspath(args.root)
+    if args.dataset:
+        sys.path.insert(0, BENCH_DIR)
+        import generate_dataset
+        try:
+            root = generate_dataset.prepare_root(os.path.join(generate_dataset.DATASET_DIR, args.dataset))
+        except FileNotFoundError as e:
+            print(e)
+            return 1
+    os.chdir(root)
+    sys.path[:0] = [root, BENCH_DIR]
+    import cases
+
+    benchmarks = [b for b in cases.build() if not args.only or args.only in b.name]
+    baseline = load_baseline(baseline_name)
+    loop = asyncio.new_event_loop()
+    # The cogs print diagnostics on every lookup; keep them out of the results table
+    quiet = open(os.devnull, "w")
+    results = {}
+    regressions = []
+    failures = []
+
+    print(f"{'benchmark':<45} {'per call':>10} {'baseline':>10}  status")
+    for benchmark in benchmarks:
+        os.chdir(benchmark.cwd or root)
+        try:
+            with contextlib.redirect_stdout(quiet):
+                seconds = measure(benchmark, loop)
+        except FileNotFoundError as e:
+            # Data files that aren't in this checkout (e.g. Data/csv/pokemon_moves.csv)
+            print(f"{benchmark.name:<45} {'-':>10} {'-':>10}  skipped ({e})")
+            continue
+        except Exception as e:
+            print(f"{benchmark.name:<45} {'-':>10} {'-':>10}  FAILED ({type(e).__name__}: {e})")
+            failures.append(benchmark.name)
+            continue
+        finally:
+            os.chdir(root)
+        results[benchmark.name] = seconds
+        status, regressed = compare(benchmark, seconds, baseline)
+        if regressed:
+            regressions.append(benchmark.name)
+        previous = baseline.get(benchmark.name)
+        print(f"{benchmark.name:<45} {format_seconds(seconds):>10} "
+              f"{format_seconds(previous) if previous else '-':>10}  {status}")
+    loop.close()
+    quiet.close()
+
+    if failures:
+        print(f"\n{len(failures)} benchmark(s) failed: {', '.join(failures)}")
+        return 1
+    if args.save_baseline:
+        save_baseline(baseline_name, results)
+        print(f"\nSaved {len(results)} results to {baseline_path(baseline_name)}")
+        return 0
+    if regressions:
+        print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
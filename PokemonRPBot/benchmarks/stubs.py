@@ -0,0 +1,188 @@
+"""
+Stand-ins for the discord.py objects our cogs touch, so handlers can run without Discord.
+Every response, followup and edit is captured on the interaction instead of being sent.
+"""
+import itertools
+from types import SimpleNamespace
+
+import discord
+
+_ids = itertools.count(1_000_000_000_000_000_000)
+
+
+class StubUser:
+    def __init__(self, user_id: int = None, name: str = "Trainer", bot: bool = False):
+        self.id = user_id or next(_ids)
+        self.name = name
+        self.display_name = name
+        self.global_name = name
+        self.bot = bot
+        self.mention = f"<@{self.id}>"
+
+    def __str__(self):
+        return self.name
+
+
+class StubMessage:
+    def __init__(self, channel, content=None, **kwargs):
+        self.id = next(_ids)
+        self.channel = channel
+        self.content = content
+        self.kwargs = kwargs
+        self.deleted = False
+
+    async def edit(self, **kwargs):
+        self.content = kwargs.get("content", self.content)
+        self.kwargs.update(kwargs)
+        return self
+
+    async def delete(self, delay: float = None):
+        self.deleted = True
+
+    async def add_reaction(self, emoji):
+        pass
+
+
+class StubChannel:
+    def __init__(self, channel_id: int = None, name: str = "roleplay"):
+        self.id = channel_id or next(_ids)
+        self.name = name
+        self.mention = f"<#{self.id}>"
+        self.sent = []
+
+    async def send(self, content=None, **kwargs):
+        message = StubMessage(self, content, **kwargs)
+        self.sent.append(message)
+        return message
+
+    def get_partial_message(self, message_id: int):
+        message = StubMessage(self)
+        message.id = message_id
+        return message
+
+
+class StubGuild:
+    def __init__(self, guild_id: int = None, member_count: int = 0):
+        self.id = guild_id or next(_ids)
+        self.name = "Benchmark Guild"
+        self.members = [StubUser(name=f"Member {i}") for i in range(member_count)]
+        self._members = {member.id: member for member in self.members}
+        self.text_channels = []
+
+    def get_member(self, user_id: int):
+        return self._members.get(user_id)
+
+    async def query_members(self, query: str, *, limit: int = 5, cache: bool = True):
+        # The gateway's member search: case-insensitive name prefix
+        query = query.lower()
+        return [member for member in self.members if member.name.lower().startswith(query)][:limit]
+
+
+class StubResponse:
+    """Mirrors discord.InteractionResponse: one initial response, then is_done() is True."""
+
+    def __init__(self, interaction):
+        self._parent = interaction
+        self._done = False
+        self.calls = []
+
+    def is_done(self) -> bool:
+        return self._done
+
+    def _respond(self, kind: str, args, kwargs):
+        if self._done:
+            raise discord.InteractionResponded(self._parent)
+        self._done = True
+        self.calls.append((kind, args, kwargs))
+
+    async def send_message(self, *args, **kwargs):
+        self._respond("send_message", args, kwargs)
+
+    async def defer(self, *args, **kwargs):
+        self._respond("defer", args, kwargs)
+
+    async def edit_message(self, *args, **kwargs):
+        self._respond("edit_message", args, kwargs)
+
+    async def send_modal(self, *args, **kwargs):
+        self._respond("send_modal", args, kwargs)
+
+    async def autocomplete(self, choices):
+        self._respond("autocomplete", (choices,), {})
+
+
+class StubFollowup:
+    def __init__(self, interaction):
+        self._parent = interaction
+        self.sent = []
+
+    async def send(self, content=None, **kwargs):
+        message = StubMessage(self._parent.channel, content, **kwargs)
+        self.sent.append(message)
+        return message
+
+
+class StubInteraction:
+    """Enough of discord.Interaction for command, button and autocomplete callbacks."""
+
+    def __init__(self, user: StubUser = None, guild: StubGuild = None, channel: StubChannel = None,
+                 client=None, data: dict = None):
+        self.id = next(_ids)
+        self.user = user or StubUser()
+        self.guild = guild
+        self.guild_id = guild.id if guild else None
+        self.channel = channel or StubChannel()
+        self.channel_id = self.channel.id
+        self.client = client
+        self.data = data or {}
+        self.message = None
+        self.created_at = discord.utils.utcnow()
+        self.command_failed = False
+        self.response = StubResponse(self)
+        self.followup = StubFollowup(self)
+        self.edits = []
+
+    async def edit_original_response(self, **kwargs):
+        self.edits.append(kwargs)
+        return StubMessage(self.channel, kwargs.get("content"))
+
+    async def original_response(self):
+        return StubMessage(self.channel)
+
+    @property
+    def outputs(self) -> list:
+        """Everything the handler sent, in order: the initial response, followups and edits."""
+        return self.response.calls + self.followup.sent + self.edits
+
+
+class StubClient:
+    """The handful of Bot/Client attributes cogs read in __init__ and handlers."""
+
+    def __init__(self, guilds: list = None):
+        self.user = StubUser(name="PokemonRPBot", bot=True)
+        self.guilds = guilds or []
+        self.channels = {}
+        self.persistent_views = []
+        self.dynamic_items = []
+        self.tree = SimpleNamespace(get_commands=lambda: [])
+
+    def get_channel(self, channel_id: int):
+        return self.channels.setdefault(channel_id, StubChannel(channel_id))
+
+    async def fetch_channel(self, channel_id: int):
+        return self.get_channel(channel_id)
+
+    def get_guild(self, guild_id: int):
+        return next((guild for guild in self.guilds if guild.id == guild_id), None)
+
+    def add_view(self, view, *, message_id: int = None):
+        self.persistent_views.append(view)
+
+    def add_dynamic_items(self, *items):
+        self.dynamic_items.extend(items)
+
+    async def wait_until_ready(self):
+        pass
+
+    def is_closed(self) -> bool:
+        return False
@@ -1,10 +1,29 @@
+import config
+import memory_report
+import startup_profiler
+if config.MEMORY_TRACKING:
+    memory_report.start()
+if startup_profiler.requested(config.PROFILE_STARTUP):
+    # Start before anything heavy is imported so those imports are timed too
+    startup_profiler.start()
+
 import discord_token
 import discord
 from discord.ext import commands
-import config
 import sys
 import os
+import asyncio
+import hashlib
+import json
+import time
 import folder_manager  # Import the folder manager
+import metrics  # Interaction latency, error and loop lag metrics
+import deferral_guard  # Auto-defers slow interaction handlers
+import loop_watchdog  # Opt-in event loop stall detector
+import sharding  # Optional AutoShardedBot and per-shard readiness
+import member_cache  # Lazy, bounded guild member cache
+from message_pipeline import pipeline  # Pattern-triggered message listeners
+from message_registry import registry as own_messages  # IDs of recent bot DMs, for ❌ deletes
 
 # Add the root directory to sys.path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
@@ -14,39 +33,106 @@ intents = discord.Intents.default()
 intents.message_content = True  # Enable message content intent
 intents.reactions = True         # Enable reaction intent
 intents.guilds = True            # Enable guilds intent
-intents.members = True  # This enables the members intent
+intents.members = True  # This enables the members intent (see config.MEMBER_CACHE for what gets cached)
 
-# Initialize bot with the updated intents
-bot = commands.Bot(command_prefix="!", intents=intents)
+# Hash of the last command tree synced with Discord
+COMMAND_TREE_HASH_FILE = "command_tree_hash.txt"
 
-async def load_commands():
-    for extension in config.COMMANDS:
-        try:
+# Initialize bot with the updated intents (an AutoShardedBot when config.SHARDING is on)
+bot = sharding.create_bot(command_prefix="!", intents=intents, **member_cache.bot_options())
+sharding.install(bot)
+
+# Time every app command, autocomplete, button/select callback and modal
+metrics.instrument()
+# ...and defer the ones that are about to miss Discord's 3 second deadline
+deferral_guard.install()
+
+async def load_extension(extension):
+    try:
+        with startup_profiler.phase("extension", extension):
             await bot.load_extension(extension)
-            print(f"Loaded extension: {extension}")
-        except Exception as e:
-            print(f"Failed to load extension {extension}: {e}")
+        print(f"Loaded extension: {extension}")
+    except Exception as e:
+        print(f"Failed to load extension {extension}: {e}")
+
+async def load_commands():
+    # Extensions don't depend on each other, so their async setup can overlap
+    await asyncio.gather(*(load_extension(extension) for extension in config.COMMANDS))
+
+def command_tree_hash():
+    """Hash of the global command payload that tree.sync() would upload."""
+    payload = sorted(
+        (command.to_dict(bot.tree) for command in bot.tree.get_commands()),
+        key=lambda command: (command.get("type", 1), command["name"])
+    )
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+async def sync_commands():
+    """Sync the command tree with Discord, skipping it when nothing changed since the last sync."""
+    tree_hash = command_tree_hash()
+    if os.path.exists(COMMAND_TREE_HASH_FILE):
+        with open(COMMAND_TREE_HASH_FILE, "r", encoding="utf-8") as f:
+            if f.read().strip() == tree_hash:
+                print("Command tree unchanged, skipping sync.")
+                return
+
+    await bot.tree.sync()
+    with open(COMMAND_TREE_HASH_FILE, "w", encoding="utf-8") as f:
+        f.write(tree_hash)
+    print("Commands loaded and synced with Discord.")
 
 @bot.event
-async def on_ready():
-    print(f"Logged in as {bot.user}")
-    
-    # Set up folders for all guilds
+async def setup_hook():
+    # Runs once per process, before the gateway connects (unlike on_ready, which fires on every reconnect)
     try:
-        await folder_manager.setup_folders(bot)
-        print("Folders set up for all guilds.")
+        await metrics.start()
     except Exception as e:
-        print(f"Error setting up folders: {e}")
-    
-    # Load commands
-    await load_commands()
-    
-    # Sync commands with Discord
+        print(f"Error starting metrics endpoint: {e}")
+    loop_watchdog.start()
+    sharding.start(bot)
+
+    start = time.perf_counter()
+    with startup_profiler.phase("startup", "load extensions"):
+        await load_commands()
+    print(f"[startup] Loaded extensions in {time.perf_counter() - start:.2f}s")
+
+    start = time.perf_counter()
     try:
-        await bot.tree.sync()
-        print("Commands loaded and synced with Discord.")
+        with startup_profiler.phase("startup", "command tree sync"):
+            await sync_commands()
     except Exception as e:
         print(f"Error syncing commands: {e}")
+    print(f"[startup] Command tree sync took {time.perf_counter() - start:.2f}s")
+
+async def setup_guild_folders(shard_id=None):
+    start = time.perf_counter()
+    name = "folder setup" if shard_id is None else f"folder setup shard {shard_id}"
+    try:
+        with startup_profiler.phase("startup", name):
+            await folder_manager.setup_folders(bot, shard_id)
+        print("Folders set up for all guilds." if shard_id is None else f"Folders set up for shard {shard_id}.")
+    except Exception as e:
+        print(f"Error setting up folders: {e}")
+    print(f"[startup] {name.capitalize()} took {time.perf_counter() - start:.2f}s")
+
+@bot.event
+async def on_shard_ready(shard_id):
+    # Only dispatched by AutoShardedBot; each shard sets up its own guilds as soon as it is ready
+    await setup_guild_folders(shard_id)
+
+@bot.event
+async def on_ready():
+    print(f"Logged in as {bot.user}")
+
+    # Set up folders for all guilds (sharded bots already did this per shard)
+    if not sharding.is_sharded(bot):
+        await setup_guild_folders()
+
+    # First ready: stop the import hook and write the startup report (no-op on reconnects)
+    startup_profiler.finish()
+    if config.MEMORY_TRACKING and memory_report._baseline is None:
+        # Growth in /debug memory is measured from the first time the bot was fully up
+        await asyncio.to_thread(memory_report.set_baseline)
 
 # Register the on_guild_join event from folder_manager
 try:
@@ -55,14 +141,34 @@ try:
 except Exception as e:
     print(f"Error registering on_guild_join event: {e}")
 
-# Add reaction-based message deletion functionality
+# Single message entry point: prefix commands once, then the pattern listeners
+@bot.event
+async def on_message(message):
+    if message.author.id == bot.user.id and message.guild is None:
+        own_messages.add(message.id)
+    await bot.process_commands(message)
+    await pipeline.dispatch(message)
+
+# Add reaction-based message deletion functionality. The raw event fires for every message, cached or
+# not (so it works after restarts), and the message is deleted without fetching it first
 @bot.event
-async def on_reaction_add(reaction, user):
-    # Check if the message is sent by the bot and the reaction is the "X" emoji
-    if reaction.message.author == bot.user and str(reaction.emoji) == "❌":
-        # Ensure the user reacting is not a bot
-        if not user.bot:
-            await reaction.message.delete()
+async def on_raw_reaction_add(payload):
+    if str(payload.emoji) != "❌" or payload.user_id == bot.user.id:
+        return
+    # Discord tells us the author of guild messages; DMs only have the registry of recent ones
+    if payload.message_author_id != bot.user.id and payload.message_id not in own_messages:
+        return
+    # Ensure the user reacting is not a bot
+    user = payload.member or bot.get_user(payload.user_id)
+    if user is not None and user.bot:
+        return
+    try:
+        await bot.get_partial_messageable(payload.channel_id).get_partial_message(payload.message_id).delete()
+    except discord.NotFound:
+        pass
+    except discord.HTTPException as e:
+        print(f"Failed to delete message {payload.message_id}: {e}")
+    own_messages.discard(payload.message_id)
 
 # Test command to send a deletable message
 @bot.command()
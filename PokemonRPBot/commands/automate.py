@@ -4,6 +4,8 @@ from discord.ext import commands
 from helpers import ParsedRollQuery
 import random
 
+from view_lifecycle import ExpiringView
+
 def count_successes_from_result(result_text):
     import re
     match = re.search(r"\*\*(\d+)\*\* Success", result_text)
@@ -55,7 +57,7 @@ def build_crit_line_for_initial(crit_die, crit_roll_number, was_crit, dmg_result
 def build_crit_line_for_reroll(final_successes):
     return f"Use ```/crit damage:{final_successes}``` and fill out the other parameters to determine the damage."
 
-class Roll2View(discord.ui.View):
+class Roll2View(ExpiringView):
     def __init__(
         self,
         acc_query_str,
@@ -69,10 +71,11 @@ class Roll2View(discord.ui.View):
         was_crit,
         crit_final_successes
     ):
-        super().__init__(timeout=None)
+        super().__init__()
         self.acc_query_str = acc_query_str
         self.dmg_query_str = dmg_query_str
-        self.interaction_user = interaction_user
+        # Only the id, the view can outlive the member object by a while
+        self.user_id = interaction_user.id
         self.rerolled = False
         self.acc_successes = acc_successes
         self.original_miss = original_miss
@@ -87,7 +90,7 @@ class Roll2View(discord.ui.View):
             self.children[1].disabled = True
 
     async def interaction_check(self, interaction: discord.Interaction) -> bool:
-        if interaction.user != self.interaction_user:
+        if interaction.user.id != self.user_id:
             await interaction.response.send_message(
                 "Only the original roller can reroll!",
                 ephemeral=True
@@ -109,12 +112,7 @@ class Roll2View(discord.ui.View):
         raw_successes = count_successes_from_result(acc_result)
         final_successes = max(0, raw_successes + self.accuracy_mod)
 
-        for child in self.children:
-            child.disabled = True
-        try:
-            await interaction.message.edit(view=self)
-        except Exception:
-            pass
+        await self.expire(interaction.message)
 
         if final_successes == 0:
             content = f"{format_accuracy_result(acc_result, raw_successes, self.accuracy_mod)}\n\n**Miss!**"
@@ -145,12 +143,7 @@ class Roll2View(discord.ui.View):
     async def reroll_damage(self, interaction: discord.Interaction, button: discord.ui.Button):
         self.rerolled = True
         dmg_result = ParsedRollQuery.from_query(self.dmg_query_str).execute()
-        for child in self.children:
-            child.disabled = True
-        try:
-            await interaction.message.edit(view=self)
-        except Exception:
-            pass
+        await self.expire(interaction.message)
         content = f"**Damage Roll:**\n{dmg_result}"
         await interaction.response.send_message(content=content, ephemeral=False)
 
@@ -263,7 +256,7 @@ class AutomateRoll(commands.Cog):
             was_crit,
             crit_final_successes
         )
-        await interaction.response.send_message(content=content.strip(), view=view)
+        await view.send(interaction, content=content.strip())
 
 async def setup(bot):
     await bot.add_cog(AutomateRoll(bot))
@@ -0,0 +1,92 @@
+import discord
+from discord import app_commands
+from discord.ext import commands
+import asyncio
+import io
+import time
+
+import config
+import deferral_guard
+import loop_watchdog
+import member_cache
+import memory_report
+import sampling_profiler
+import metrics
+import sharding
+import startup_profiler
+import view_lifecycle
+
+
+class Debug(commands.Cog):
+    """Owner-only diagnostics for the running bot."""
+
+    debug = app_commands.Group(name="debug", description="Owner-only bot diagnostics")
+
+    def __init__(self, bot):
+        self.bot = bot
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if interaction.user.id != config.OWNER_ID:
+            await interaction.response.send_message("⛔ Owner only.", ephemeral=True)
+            return False
+        return True
+
+    @debug.command(name="startup", description="Show where startup time and memory went")
+    async def startup(self, interaction: discord.Interaction):
+        # Built from the live records so lazy data loads after startup show up too
+        report = startup_profiler.build_report()
+        file = discord.File(io.BytesIO(report.encode("utf-8")), filename=startup_profiler.REPORT_FILE)
+        await interaction.response.send_message(file=file, ephemeral=True)
+
+    @debug.command(name="stats", description="Per-command latency, errors, cache hit rates and loop lag")
+    async def stats(self, interaction: discord.Interaction):
+        report = f"{metrics.summary()}\n{deferral_guard.summary()}\n{sharding.summary(self.bot)}"
+        await interaction.response.send_message(f"```\n{report[:1900]}\n```", ephemeral=True)
+
+    @debug.command(name="stalls", description="Call sites that blocked the event loop")
+    async def stalls(self, interaction: discord.Interaction):
+        if loop_watchdog.watchdog is None:
+            await interaction.response.send_message("The loop watchdog is off, enable LOOP_WATCHDOG in config.py.", ephemeral=True)
+            return
+        # Also kept on disk, next to startup_profile.txt
+        loop_watchdog.watchdog.write_report()
+        await interaction.response.send_message(file=discord.File(loop_watchdog.REPORT_FILE), ephemeral=True)
+
+    @debug.command(name="profile", description="Sample the running bot for a few seconds and get a flamegraph file")
+    @app_commands.describe(seconds="How long to sample (1-60 seconds)")
+    async def profile(self, interaction: discord.Interaction, seconds: app_commands.Range[int, 1, sampling_profiler.MAX_SECONDS] = 10):
+        if sampling_profiler.is_running():
+            await interaction.response.send_message("A profile is already being captured.", ephemeral=True)
+            return
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        collapsed, samples = await sampling_profiler.capture(seconds)
+        file = discord.File(io.BytesIO(collapsed.encode("utf-8")), filename=f"profile-{int(time.time())}.collapsed")
+        await interaction.followup.send(
+            f"{samples} samples over {seconds}s. Open with speedscope or flamegraph.pl.", file=file, ephemeral=True
+        )
+
+    @debug.command(name="memory", description="Memory use by subsystem and growth since the baseline")
+    @app_commands.describe(reset_baseline="Make this report the new baseline for future growth figures")
+    async def memory(self, interaction: discord.Interaction, reset_baseline: bool = False):
+        if not memory_report.tracemalloc.is_tracing():
+            await interaction.response.send_message("Memory tracking is off, enable MEMORY_TRACKING in config.py.", ephemeral=True)
+            return
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        guilds = self.bot.guilds
+        extra = [
+            f"Cached members: {sum(len(guild.members) for guild in guilds)} in {len(guilds)} guilds, "
+            f"cached users: {len(self.bot.users)}",
+            member_cache.summary(),
+            f"Persistent views: {len(self.bot.persistent_views)}",
+            view_lifecycle.summary(),
+        ]
+        # Grouping a snapshot can take a while, keep it off the event loop
+        report = await asyncio.to_thread(memory_report.build_report, extra)
+        if reset_baseline:
+            await asyncio.to_thread(memory_report.set_baseline)
+        memory_report.write_report(report)
+        await interaction.followup.send(file=discord.File(memory_report.REPORT_FILE), ephemeral=True)
+
+
+async def setup(bot):
+    await bot.add_cog(Debug(bot))
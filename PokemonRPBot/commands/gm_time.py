@@ -3,14 +3,19 @@ from __future__ import annotations
 import asyncio
 import json
 import math
+import os
 import re
+from collections import deque
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
 import discord
-from discord.ext import commands
+from discord.ext import commands, tasks
 from discord import app_commands
 
+import member_cache
+
 
 class GMTime(commands.Cog):
     """Cog providing GM time-tracking and currency-management slash commands."""
@@ -20,16 +25,44 @@ class GMTime(commands.Cog):
     POKE_PER_HOUR:   int = 225
     CREDITS_PER_HOUR = 100
 
-    DATA_DIR  = Path("Data")
-    DATA_FILE = DATA_DIR / "gm_time.json"
+    DATA_DIR      = Path("Data")
+    # Profiles from before the ledger; only read as opening balances when there is no snapshot yet
+    DATA_FILE     = DATA_DIR / "gm_time.json"
+    # Every entry and spend, one JSON object per line; appended to, never rewritten, by one bot process only
+    LEDGER_FILE   = DATA_DIR / "gm_time_ledger.jsonl"
+    # Profiles and period totals as of a ledger offset, so loading only replays the entries after it
+    SNAPSHOT_FILE = DATA_DIR / "gm_time_snapshot.json"
+
+    PROFILE_KEYS = ("time", "exp", "poke", "credits")
+    # Recent ledger entries kept per GM for /gm_history
+    HISTORY_ENTRIES = 10
+    LEADERBOARD_SIZE = 10
+    # Period totals kept in memory and in the snapshot; older ones can be summed from the ledger
+    WEEKS_KEPT  = 13
+    MONTHS_KEPT = 12
+    # Minutes between snapshots (only written when something changed)
+    SNAPSHOT_INTERVAL = 10
 
     # ────────────────────────────── init / setup ──────────────────────────────
     def __init__(self, bot: commands.Bot):
         self.bot  = bot
         self.lock = asyncio.Lock()
         self.data: Dict[str, Dict[str, Any]] = {}
+        # period key ("2025-W07" / "2025-02") -> user id -> GM hours in that period
+        self.weeks:  Dict[str, Dict[str, float]] = {}
+        self.months: Dict[str, Dict[str, float]] = {}
+        # user id -> their latest ledger entries, oldest first
+        self.recent: Dict[str, deque] = {}
+        self.ledger_offset = 0
+        self.dirty = False
         self._ensure_data_file()
         self._load_data()
+        self.snapshot_loop.start()
+
+    async def cog_unload(self):
+        self.snapshot_loop.cancel()
+        if self.dirty:
+            self._write_snapshot()
 
     # ───────────────────────────── helper view ────────────────────────────────
     class _ConfirmHoursView(discord.ui.View):
@@ -74,12 +107,10 @@ class GMTime(commands.Cog):
             poke_gain    = math.ceil(self.hours * self.cog.POKE_PER_HOUR)
             credits_gain = math.ceil(self.hours * self.cog.CREDITS_PER_HOUR)
 
-            profile = self.cog._get_or_create_profile(self.author_id)
-            profile["time"]    += self.hours
-            profile["exp"]     += exp_gain
-            profile["poke"]    += poke_gain
-            profile["credits"] += credits_gain
-            await self.cog._save_data()
+            self.cog._record(
+                self.author_id, "gm_time",
+                time=self.hours, exp=exp_gain, poke=poke_gain, credits=credits_gain,
+            )
 
             # acknowledge
             await interaction.response.defer()  # instant ack
@@ -139,16 +170,75 @@ class GMTime(commands.Cog):
             self.DATA_FILE.write_text("{}", encoding="utf-8")
 
     def _load_data(self) -> None:
+        """Load the latest snapshot, then replay the ledger entries written after it."""
         try:
-            with self.DATA_FILE.open("r", encoding="utf-8") as fp:
-                self.data = json.load(fp)
-        except (IOError, json.JSONDecodeError):
-            self.data = {}
+            with self.SNAPSHOT_FILE.open("r", encoding="utf-8") as fp:
+                snapshot = json.load(fp)
+        except FileNotFoundError:
+            snapshot = {}
+        except (IOError, json.JSONDecodeError) as e:
+            print(f"Error loading {self.SNAPSHOT_FILE}, rebuilding it from the ledger: {e}")
+            snapshot = {}
+
+        if "profiles" in snapshot:
+            self.data = snapshot["profiles"]
+        else:
+            # First start with a ledger: the old cumulative profiles become the opening balances,
+            # and the whole ledger is replayed on top of them
+            try:
+                with self.DATA_FILE.open("r", encoding="utf-8") as fp:
+                    self.data = json.load(fp)
+            except (IOError, json.JSONDecodeError):
+                self.data = {}
+        self.weeks  = snapshot.get("weeks", {})
+        self.months = snapshot.get("months", {})
+        self.recent = {
+            uid: deque(entries, maxlen=self.HISTORY_ENTRIES)
+            for uid, entries in snapshot.get("recent", {}).items()
+        }
+        self.ledger_offset = snapshot.get("ledger_offset", 0)
+        # Snapshots from before the retention window kept every period
+        self._prune_periods(self.weeks, self.WEEKS_KEPT)
+        self._prune_periods(self.months, self.MONTHS_KEPT)
+
+        if not self.LEDGER_FILE.exists():
+            return
+        with self.LEDGER_FILE.open("rb+") as fp:
+            fp.seek(self.ledger_offset)
+            for line in fp:
+                if not line.endswith(b"\n"):
+                    # An entry cut short by a crash; drop it so the next append starts on a new line
+                    fp.truncate(self.ledger_offset)
+                    break
+                try:
+                    self._apply(json.loads(line))
+                except (json.JSONDecodeError, KeyError) as e:
+                    print(f"Skipping a bad GM time ledger line: {e}")
+                self.ledger_offset += len(line)
+                self.dirty = True
+
+    def _write_snapshot(self) -> None:
+        snapshot = {
+            "ledger_offset": self.ledger_offset,
+            "profiles": self.data,
+            "weeks": self.weeks,
+            "months": self.months,
+            "recent": {uid: list(entries) for uid, entries in self.recent.items()},
+        }
+        temporary = self.SNAPSHOT_FILE.with_suffix(".tmp")
+        with temporary.open("w", encoding="utf-8") as fp:
+            json.dump(snapshot, fp, ensure_ascii=False)
+        os.replace(temporary, self.SNAPSHOT_FILE)
+        self.dirty = False
 
     async def _save_data(self) -> None:
         async with self.lock:
-            with self.DATA_FILE.open("w", encoding="utf-8") as fp:
-                json.dump(self.data, fp, ensure_ascii=False, indent=4)
+            self._write_snapshot()
+
+    @tasks.loop(minutes=SNAPSHOT_INTERVAL)
+    async def snapshot_loop(self):
+        if self.dirty:
+            await self._save_data()
 
     def _get_or_create_profile(self, user_id: int) -> Dict[str, Any]:
         uid = str(user_id)
@@ -156,6 +246,47 @@ class GMTime(commands.Cog):
             self.data[uid] = {"time": 0.0, "exp": 0, "poke": 0, "credits": 0}
         return self.data[uid]
 
+    @staticmethod
+    def _periods(timestamp: datetime) -> tuple[str, str]:
+        year, week, _ = timestamp.isocalendar()
+        return f"{year}-W{week:02d}", f"{timestamp.year}-{timestamp.month:02d}"
+
+    @staticmethod
+    def _prune_periods(periods: Dict[str, Dict[str, float]], kept: int) -> None:
+        # Period keys sort chronologically ("2025-W07" < "2025-W12" < "2026-W01")
+        for key in sorted(periods)[:-kept]:
+            del periods[key]
+
+    def _add_period_hours(self, periods: Dict[str, Dict[str, float]], key: str, kept: int, uid: str, hours: float) -> None:
+        if key not in periods:
+            periods[key] = {}
+            self._prune_periods(periods, kept)
+        totals = periods.get(key)
+        if totals is not None:
+            totals[uid] = totals.get(uid, 0.0) + hours
+
+    def _apply(self, entry: Dict[str, Any]) -> None:
+        """Add one ledger entry to the profiles, the period totals and the recent history."""
+        uid = entry["user_id"]
+        profile = self._get_or_create_profile(int(uid))
+        for key in self.PROFILE_KEYS:
+            profile[key] += entry.get(key, 0)
+        if entry.get("time"):
+            week, month = self._periods(datetime.fromisoformat(entry["timestamp"]))
+            self._add_period_hours(self.weeks, week, self.WEEKS_KEPT, uid, entry["time"])
+            self._add_period_hours(self.months, month, self.MONTHS_KEPT, uid, entry["time"])
+        self.recent.setdefault(uid, deque(maxlen=self.HISTORY_ENTRIES)).append(entry)
+
+    def _record(self, user_id: int, kind: str, **amounts) -> None:
+        """Append an entry to the ledger and apply it. amounts are profile changes, e.g. credits=-50."""
+        entry = {"timestamp": datetime.utcnow().isoformat(), "user_id": str(user_id), "kind": kind, **amounts}
+        line = (json.dumps(entry, ensure_ascii=False) + "\n").encode("utf-8")
+        with self.LEDGER_FILE.open("ab") as fp:
+            fp.write(line)
+        self.ledger_offset += len(line)
+        self._apply(entry)
+        self.dirty = True
+
     # ───────────────────────────── slash commands ─────────────────────────────
     @app_commands.guilds(discord.Object(id=1271249120526602342))
     @app_commands.guild_only()
@@ -198,12 +329,10 @@ class GMTime(commands.Cog):
         poke_gain    = math.ceil(hours * self.POKE_PER_HOUR)
         credits_gain = math.ceil(hours * self.CREDITS_PER_HOUR)
 
-        profile = self._get_or_create_profile(interaction.user.id)
-        profile["time"]    += hours
-        profile["exp"]     += exp_gain
-        profile["poke"]    += poke_gain
-        profile["credits"] += credits_gain
-        await self._save_data()
+        self._record(
+            interaction.user.id, "gm_time",
+            time=hours, exp=exp_gain, poke=poke_gain, credits=credits_gain,
+        )
 
         # 4. final acknowledgement
         await interaction.response.send_message(
@@ -226,15 +355,10 @@ class GMTime(commands.Cog):
         if not guild:
             return []
 
-        current_lower = current.lower()
-        choices: List[app_commands.Choice[str]] = []
-        for member in guild.members:
-            name = member.display_name
-            if current_lower in name.lower():
-                choices.append(app_commands.Choice(name=name, value=str(member.id)))
-            if len(choices) >= 25:
-                break
-        return choices
+        return [
+            app_commands.Choice(name=member.display_name, value=str(member.id))
+            for member in await member_cache.search(guild, current, limit=25)
+        ]
     
     @app_commands.guild_only()
     @app_commands.command(name="gm_stats", description="Show a GM's statistics.")
@@ -246,14 +370,18 @@ class GMTime(commands.Cog):
 
         # Use display name only – no ping
         if interaction.guild:
-            member_obj = interaction.guild.get_member(target_id)
+            member_obj = await member_cache.get_member(interaction.guild, target_id)
             display_name = member_obj.display_name if member_obj else f"User ID {target_id}"
         else:
             display_name = f"User ID {target_id}"
 
+        week, month = self._periods(datetime.utcnow())
+        uid = str(target_id)
         message = (
             f"## GM statistics for {display_name}\n"
-            f"GM Time: **{profile['time']:.2f}** hours\n"
+            f"GM Time: **{profile['time']:.2f}** hours "
+            f"(this week: **{self.weeks.get(week, {}).get(uid, 0.0):.2f}**, "
+            f"this month: **{self.months.get(month, {}).get(uid, 0.0):.2f}**)\n"
             f"GM Exp: **{profile['exp']}** (Please use /player_info to display the correct amount!)\n"
             f"GM Poke: **{profile['poke']}**\n"
             f"GM Credits: **{profile['credits']}**"
@@ -261,6 +389,66 @@ class GMTime(commands.Cog):
 
         await interaction.response.send_message(message)
 
+    # ------------------------- leaderboard / history -------------------------
+    @app_commands.guilds(discord.Object(id=1271249120526602342))
+    @app_commands.guild_only()
+    @app_commands.command(name="gm_leaderboard", description="Rank GMs by hours run.")
+    @app_commands.describe(period="Which hours to count (defaults to this week)")
+    @app_commands.choices(period=[
+        app_commands.Choice(name="This week", value="week"),
+        app_commands.Choice(name="This month", value="month"),
+        app_commands.Choice(name="All time", value="all"),
+    ])
+    async def gm_leaderboard(self, interaction: discord.Interaction, period: str = "week"):
+        week, month = self._periods(datetime.utcnow())
+        if period == "week":
+            totals, title = self.weeks.get(week, {}), f"this week ({week})"
+        elif period == "month":
+            totals, title = self.months.get(month, {}), f"this month ({month})"
+        else:
+            totals, title = {uid: profile["time"] for uid, profile in self.data.items()}, "all time"
+
+        ranked = sorted(((hours, uid) for uid, hours in totals.items() if hours > 0), reverse=True)
+        if not ranked:
+            await interaction.response.send_message(f"No GM time stored for {title} yet.")
+            return
+        lines = [
+            f"{place}. <@{uid}> – **{hours:.2f}** h"
+            for place, (hours, uid) in enumerate(ranked[:self.LEADERBOARD_SIZE], start=1)
+        ]
+        await interaction.response.send_message(
+            f"## GM leaderboard, {title}\n" + "\n".join(lines),
+            allowed_mentions=discord.AllowedMentions.none(),
+        )
+
+    @app_commands.guilds(discord.Object(id=1271249120526602342))
+    @app_commands.guild_only()
+    @app_commands.command(name="gm_history", description="Show a GM's latest time entries and spends.")
+    @app_commands.describe(member="Select a GM (optional, defaults to you)")
+    @app_commands.autocomplete(member=user_autocomplete)
+    async def gm_history(self, interaction: discord.Interaction, member: Optional[str] = None):
+        target_id = int(member) if member else interaction.user.id
+        entries = self.recent.get(str(target_id))
+        if not entries:
+            await interaction.response.send_message(f"No GM time entries for <@{target_id}> yet.",
+                                                    allowed_mentions=discord.AllowedMentions.none())
+            return
+
+        lines = []
+        for entry in reversed(entries):
+            when = discord.utils.format_dt(datetime.fromisoformat(entry["timestamp"]).replace(tzinfo=timezone.utc), "d")
+            if entry["kind"] == "gm_time":
+                lines.append(f"{when} Stored **{entry['time']:.2f}** h (+{entry['exp']} Exp, +{entry['poke']} Poke, "
+                             f"+{entry['credits']} Credits)")
+            elif entry["kind"] == "spend_credits":
+                lines.append(f"{when} Spent **{-entry['credits']}** GM Credits")
+            elif entry["kind"] == "spend_poke":
+                lines.append(f"{when} Spent **{-entry['poke']}** GM Poke")
+        await interaction.response.send_message(
+            f"## Latest GM entries for <@{target_id}>\n" + "\n".join(lines),
+            allowed_mentions=discord.AllowedMentions.none(),
+        )
+
     # ------------------------------ spend commands ---------------------------
     @app_commands.guilds(discord.Object(id=1271249120526602342))
     @app_commands.guild_only()
@@ -276,8 +464,7 @@ class GMTime(commands.Cog):
             await interaction.response.send_message("You do not have enough GM Credits.", ephemeral=True)
             return
 
-        profile["credits"] -= amount
-        await self._save_data()
+        self._record(interaction.user.id, "spend_credits", credits=-amount)
         await interaction.response.send_message(
             f"Spent **{amount}** GM Credits. You have **{profile['credits']}** left."
         )
@@ -296,21 +483,11 @@ class GMTime(commands.Cog):
             await interaction.response.send_message("You do not have enough GM Poke.", ephemeral=True)
             return
 
-        profile["poke"] -= amount
-        await self._save_data()
+        self._record(interaction.user.id, "spend_poke", poke=-amount)
         await interaction.response.send_message(
             f"Spent **{amount}** GM Poke. You have **{profile['poke']}** left."
         )
 
-    # ───────────────────────────── cog lifecycle ──────────────────────────────
-    @commands.Cog.listener()
-    async def on_ready(self):
-        try:
-            synced = await self.bot.tree.sync()
-            print(f"[GMTime] Synced {len(synced)} commands.")
-        except Exception as e:
-            print(f"[GMTime] Failed to sync commands: {e!r}")
-
 
 async def setup(bot: commands.Bot):
     """Standard entry point for `discord.ext.commands` extension loading."""
@@ -4,6 +4,8 @@ from discord.ext import commands
 import json
 import os
 import re
+import startup_profiler
+from paginator import PageLayout, layout_sections, send_paginated
 
 def normalize_name(name: str) -> str:
     """
@@ -58,6 +60,17 @@ def find_evolution_key(normalized: str, evo_data: dict) -> str:
 def format_moves(moves_list: list) -> str:
     return "  |  ".join(moves_list) if moves_list else "None"
 
+def build_all_moves_layout(pokemon_data: dict) -> PageLayout:
+    """Lays out the TM/Egg/Tutor sections of a movelist into pages."""
+    header = f"### {pokemon_data.get('name', 'Unknown')} [#{pokemon_data.get('number', '?')}]"
+    moves = pokemon_data.get("moves", {})
+    sections = [
+        ("TM Moves", f":cd: **TM Moves**\n{format_moves(moves.get('tm', []))}"),
+        ("Egg Moves", f":egg: **Egg Moves**\n{format_moves(moves.get('egg', []))}"),
+        ("Tutor Moves", f":teacher: **Tutor Moves**\n{format_moves(moves.get('tutor', []))}")
+    ]
+    return layout_sections(header, sections)
+
 class LearnMovesView(discord.ui.View):
     def __init__(self, pokemon_data: dict, author: discord.User):
         super().__init__(timeout=180)
@@ -74,47 +87,31 @@ class LearnMovesView(discord.ui.View):
             child.disabled = True
         await interaction.response.edit_message(view=self)
 
-        header = f"### {self.pokemon_data.get('name', 'Unknown')} [#{self.pokemon_data.get('number', '?')}]"
-        moves = self.pokemon_data.get("moves", {})
-
-        tm_moves = format_moves(moves.get("tm", []))
-        egg_moves = format_moves(moves.get("egg", []))
-        tutor_moves = format_moves(moves.get("tutor", []))
-
-        sections = [
-            (":cd: **TM Moves**", tm_moves),
-            (":egg: **Egg Moves**", egg_moves),
-            (":teacher: **Tutor Moves**", tutor_moves)
-        ]
-
-        messages = []
-        current_message = header
-        for title, content in sections:
-            section_text = f"{title}\n{content}"
-            if len(current_message) + 2 + len(section_text) > 2000:
-                messages.append(current_message)
-                current_message = header + "\n\n" + section_text
-            else:
-                current_message += "\n\n" + section_text
-        messages.append(current_message)
-
-        for msg in messages:
-            await interaction.followup.send(msg, ephemeral=False)
+        await send_paginated(
+            interaction,
+            f"learns:allmoves:{normalize_name(self.pokemon_data.get('name', 'Unknown'))}",
+            lambda: build_all_moves_layout(self.pokemon_data),
+            followup=True
+        )
 
 class MovesCog(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
-        # Load evolution data from data/pokemon_evolutions.json
-        evolution_file = os.path.join("data", "pokemon_evolutions.json")
-        if os.path.exists(evolution_file):
-            try:
-                with open(evolution_file, "r", encoding="utf-8") as f:
-                    self.evolution_data = json.load(f)
-            except Exception as e:
-                print(f"Error loading evolution data: {e}")
-                self.evolution_data = {}
-        else:
-            self.evolution_data = {}
+        self._evolution_data = None
+
+    @property
+    def evolution_data(self) -> dict:
+        """Evolution data from data/pokemon_evolutions.json, loaded the first time /learns needs it."""
+        if self._evolution_data is None:
+            evolution_file = os.path.join("data", "pokemon_evolutions.json")
+            self._evolution_data = {}
+            if os.path.exists(evolution_file):
+                try:
+                    with startup_profiler.phase("data", "learns evolution data"), open(evolution_file, "r", encoding="utf-8") as f:
+                        self._evolution_data = json.load(f)
+                except Exception as e:
+                    print(f"Error loading evolution data: {e}")
+        return self._evolution_data
 
     def load_related_data(self, rel: str) -> dict:
         """
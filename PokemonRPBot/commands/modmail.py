@@ -1,17 +1,28 @@
 import discord
 from discord.ext import commands
 from discord import app_commands
+import asyncio
 import uuid
 import json
 import os
 
-# Path to the JSON file for persistent storage.
+import member_cache
+
+# Directory holding one JSON file per mod mail record, so a claim only rewrites its own record.
+RECORDS_DIR = "mod_mail_records"
+# The single-file store used before, moved into RECORDS_DIR on load.
 DATA_FILE = "mod_mail_records.json"
+# DMs sent or edited at once when fanning out to the mods. discord.py already waits out rate limits
+# per route; this keeps a large mod team from piling every request onto them at the same time.
+DM_CONCURRENCY = 5
 
 class ClaimView(discord.ui.View):
-    def __init__(self, mod_mail_id, cog, disabled=False):
+    """
+    One persistent view handles the claim buttons of every mod mail DM; the record is looked up by
+    the message the button is on.
+    """
+    def __init__(self, cog, disabled=False):
         super().__init__(timeout=None)
-        self.mod_mail_id = mod_mail_id
         self.cog = cog
         # Disable all buttons if this mod mail has been claimed.
         for item in self.children:
@@ -20,7 +31,8 @@ class ClaimView(discord.ui.View):
     @discord.ui.button(label="Claim", style=discord.ButtonStyle.primary, custom_id="claim_button")
     async def claim(self, interaction: discord.Interaction, button: discord.ui.Button):
         # Retrieve the mod mail record.
-        record = self.cog.mod_mail_records.get(self.mod_mail_id)
+        mod_mail_id = self.cog.records_by_message.get(interaction.message.id)
+        record = self.cog.mod_mail_records.get(mod_mail_id)
         if record is None:
             await interaction.response.send_message("Mod mail record not found.", ephemeral=True)
             return
@@ -32,7 +44,7 @@ class ClaimView(discord.ui.View):
             return
 
         # Get the member object (since in a DM, interaction.user is a User, not a Member).
-        member = guild.get_member(interaction.user.id)
+        member = await member_cache.get_member(guild, interaction.user.id)
         if member is None:
             await interaction.response.send_message("Could not verify your membership in the guild.", ephemeral=True)
             return
@@ -54,13 +66,13 @@ class ClaimView(discord.ui.View):
         # Mark this mod mail as claimed.
         record["claimed"] = True
         record["claimer_id"] = interaction.user.id
-
-        # Update all DM messages to disable the claim button.
-        await self.cog.update_mod_mail_views(self.mod_mail_id)
-        await self.cog.save_mod_mail_records()
+        await self.cog.save_mod_mail_record(mod_mail_id)
 
         await interaction.response.send_message("You have claimed this mod mail.", ephemeral=True)
 
+        # Update all DM messages to disable the claim button.
+        await self.cog.update_mod_mail_views(mod_mail_id)
+
         # Notify the original user if the mail wasn't sent anonymously.
         if not record.get("anonymous", True) and "user_id" in record:
             try:
@@ -71,6 +83,12 @@ class ClaimView(discord.ui.View):
             except Exception as e:
                 print(f"Failed to notify user: {e}")
 
+def message_view(cog, disabled=False) -> ClaimView:
+    """A ClaimView to render onto a message. The persistent view answers its clicks, so it isn't stored per message."""
+    view = ClaimView(cog, disabled=disabled)
+    view.stop()
+    return view
+
 class ModMail(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
@@ -84,59 +102,96 @@ class ModMail(commands.Cog):
         #   - messages: A list of dicts for each DM sent, holding mod_id, channel_id, and message_id.
         #   - user_id: (optional) The ID of the user who submitted the mod mail (if not anonymous).
         self.mod_mail_records = {}
+        # DM message id -> mod_mail_id, to find the record behind a claim button.
+        self.records_by_message = {}
         # Configure your moderator role ID and mod notification channel ID here:
         self.mod_role_id = 1271553707355541594       # Replace with your moderator role ID.
         self.mod_notification_channel_id = 1357082399044931695  # Replace with your notification channel ID.
+        self.dm_slots = asyncio.Semaphore(DM_CONCURRENCY)
+        self.claim_view = None
 
         self.load_mod_mail_records()
 
+    def add_record(self, mod_mail_id, record):
+        self.mod_mail_records[mod_mail_id] = record
+        for msg_info in record.get("messages", []):
+            self.records_by_message[msg_info["message_id"]] = mod_mail_id
+
+    def migrate_records_file(self):
+        """Split the old single-file store into RECORDS_DIR, keeping the old file as a backup."""
+        try:
+            with open(DATA_FILE, "r") as f:
+                records = json.load(f)
+            os.makedirs(RECORDS_DIR, exist_ok=True)
+            for mod_mail_id, record in records.items():
+                self.write_record(mod_mail_id, record)
+            os.replace(DATA_FILE, f"{DATA_FILE}.migrated")
+        except Exception as e:
+            print(f"Error migrating mod mail records: {e}")
+
     def load_mod_mail_records(self):
         """Load mod mail records from disk if available."""
+        self.mod_mail_records = {}
+        self.records_by_message = {}
         if os.path.exists(DATA_FILE):
+            self.migrate_records_file()
+        if not os.path.isdir(RECORDS_DIR):
+            return
+        for filename in os.listdir(RECORDS_DIR):
+            if not filename.endswith(".json"):
+                continue
             try:
-                with open(DATA_FILE, "r") as f:
-                    self.mod_mail_records = json.load(f)
+                with open(os.path.join(RECORDS_DIR, filename), "r") as f:
+                    self.add_record(filename[:-5], json.load(f))
             except Exception as e:
-                print(f"Error loading mod mail records: {e}")
+                print(f"Error loading mod mail record {filename}: {e}")
+
+    def write_record(self, mod_mail_id, record):
+        path = os.path.join(RECORDS_DIR, f"{mod_mail_id}.json")
+        with open(f"{path}.tmp", "w") as f:
+            json.dump(record, f)
+        os.replace(f"{path}.tmp", path)
 
-    async def save_mod_mail_records(self):
-        """Save the current mod mail records to disk."""
+    async def save_mod_mail_record(self, mod_mail_id):
+        """Save one mod mail record to disk."""
         try:
-            with open(DATA_FILE, "w") as f:
-                json.dump(self.mod_mail_records, f)
+            os.makedirs(RECORDS_DIR, exist_ok=True)
+            self.write_record(mod_mail_id, self.mod_mail_records[mod_mail_id])
         except Exception as e:
-            print(f"Error saving mod mail records: {e}")
+            print(f"Error saving mod mail record {mod_mail_id}: {e}")
 
     async def update_mod_mail_views(self, mod_mail_id):
         """
-        For a given mod mail record, fetch all stored DM messages and update their views.
+        For a given mod mail record, update the views of all stored DM messages, a few at a time.
         If the record is claimed, the claim buttons are disabled.
         """
         record = self.mod_mail_records.get(mod_mail_id)
         if not record:
             return
-        disabled = record.get("claimed", False)
-        # Iterate over each stored DM message info.
-        for msg_info in record.get("messages", []):
-            try:
-                # Get the DM channel; if not cached, fetch it.
-                channel = self.bot.get_channel(msg_info["channel_id"])
-                if channel is None:
-                    channel = await self.bot.fetch_channel(msg_info["channel_id"])
-                msg = await channel.fetch_message(msg_info["message_id"])
-                # Create a new ClaimView (disabled if already claimed).
-                view = ClaimView(mod_mail_id, self, disabled=disabled)
-                await msg.edit(view=view)
-            except Exception as e:
-                print(f"Failed to update DM message (mod_mail_id {mod_mail_id}): {e}")
+        view = message_view(self, disabled=record.get("claimed", False))
+
+        async def update(msg_info):
+            async with self.dm_slots:
+                try:
+                    # Edited by id, without fetching the DM channel or the message first.
+                    channel = self.bot.get_partial_messageable(msg_info["channel_id"], type=discord.ChannelType.private)
+                    await channel.get_partial_message(msg_info["message_id"]).edit(view=view)
+                except Exception as e:
+                    print(f"Failed to update DM message (mod_mail_id {mod_mail_id}): {e}")
+
+        await asyncio.gather(*(update(msg_info) for msg_info in record.get("messages", [])))
 
     async def cog_load(self):
         """
-        Once the cog is loaded (or after a bot restart),
-        re-bind the interactive views to any stored mod mail records.
+        Register the persistent claim view, which keeps answering the buttons on stored mod mail
+        after a bot restart.
         """
-        for mod_mail_id, record in self.mod_mail_records.items():
-            await self.update_mod_mail_views(mod_mail_id)
+        self.claim_view = ClaimView(self)
+        self.bot.add_view(self.claim_view)
+
+    async def cog_unload(self):
+        if self.claim_view:
+            self.claim_view.stop()
 
     @app_commands.command(name="modmail", description="Send a mod mail complaint")
     async def modmail(self, interaction: discord.Interaction, description: str, anonymize: bool):
@@ -163,25 +218,26 @@ class ModMail(commands.Cog):
         mod_mail_content = f"**New Mod Mail**\n**User:** {user_info}\n**Description:** {description}"
 
         # Find all mods in the guild (by checking for the specified mod role).
-        mods = [
-            member for member in interaction.guild.members
-            if any(role.id == self.mod_role_id for role in member.roles)
-        ]
-        for mod in mods:
-            try:
-                dm = await mod.create_dm()
-                view = ClaimView(mod_mail_id, self, disabled=False)
-                msg = await dm.send(content=mod_mail_content, view=view)
-                # Save the message details for persistence.
-                record["messages"].append({
-                    "mod_id": mod.id,
-                    "channel_id": dm.id,
-                    "message_id": msg.id
-                })
-            except Exception as e:
-                print(f"Could not send DM to mod {mod}: {e}")
-
-        await self.save_mod_mail_records()
+        mods = await member_cache.role_members(interaction.guild, self.mod_role_id)
+        view = message_view(self)
+
+        async def send_to(mod):
+            async with self.dm_slots:
+                try:
+                    dm = await mod.create_dm()
+                    msg = await dm.send(content=mod_mail_content, view=view)
+                    # Save the message details for persistence.
+                    record["messages"].append({
+                        "mod_id": mod.id,
+                        "channel_id": dm.id,
+                        "message_id": msg.id
+                    })
+                    self.records_by_message[msg.id] = mod_mail_id
+                except Exception as e:
+                    print(f"Could not send DM to mod {mod}: {e}")
+
+        await asyncio.gather(*(send_to(mod) for mod in mods))
+        await self.save_mod_mail_record(mod_mail_id)
 
         # Send a notification in the designated channel (pinging the mod role).
         channel = self.bot.get_channel(self.mod_notification_channel_id)
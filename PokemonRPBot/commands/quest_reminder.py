@@ -8,7 +8,13 @@ import discord
 from discord import app_commands
 from discord.ext import commands, tasks
 
+import sharding
+
+# Shard workers keep one file per shard instead, see sharding.store_paths
 REMINDERS_FILE = "quest_reminders.json"
+# Seconds between checks; reminders due within the same window are sent together
+COALESCE_WINDOW = 30.0
+MAX_MESSAGE_LENGTH = 2000
 
 class ReminderCog(commands.Cog):
     def __init__(self, bot: commands.Bot):
@@ -18,37 +24,86 @@ class ReminderCog(commands.Cog):
         self.check_reminders.start()
 
     def _load_reminders(self):
-        if os.path.exists(REMINDERS_FILE):
+        self.reminders = sharding.load_store(self.bot, REMINDERS_FILE, self._read_file)
+
+    @staticmethod
+    def _read_file(path: str) -> List[Dict]:
+        if os.path.exists(path):
             try:
-                with open(REMINDERS_FILE, "r", encoding="utf-8") as f:
+                with open(path, "r", encoding="utf-8") as f:
                     data = json.load(f)
                     if isinstance(data, list):
-                        self.reminders = data
+                        return data
             except Exception:
-                self.reminders = []
-        else:
-            self.reminders = []
+                pass
+        return []
 
     def _save_reminders(self):
-        os.makedirs(os.path.dirname(REMINDERS_FILE) or ".", exist_ok=True)
-        with open(REMINDERS_FILE, "w", encoding="utf-8") as f:
-            json.dump(self.reminders, f, ensure_ascii=False, indent=2)
+        sharding.save_store(self.bot, REMINDERS_FILE, self.reminders, self._write_file)
+
+    @staticmethod
+    def _write_file(reminders: List[Dict], path: str):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(reminders, f, ensure_ascii=False, indent=2)
+
+    @staticmethod
+    def _coalesce(reminders: List[Dict]) -> Dict[int, List[str]]:
+        """
+        Groups due reminders into one message body per channel.
+        Reminders with the same name in a channel share a line with their mentions merged.
+        """
+        by_channel: Dict[int, Dict[str, List[str]]] = {}
+        for rem in reminders:
+            names = by_channel.setdefault(rem["channel_id"], {})
+            mentions = names.setdefault(rem["reminder_name"], [])
+            for mention in rem["mentions"].split():
+                if mention not in mentions:
+                    mentions.append(mention)
+
+        messages: Dict[int, List[str]] = {}
+        for channel_id, names in by_channel.items():
+            lines = [f"{' '.join(mentions)} {name} reminder!" for name, mentions in names.items()]
+            # Stay below Discord's message limit; only very large bursts need a second message
+            chunks = [lines[0]]
+            for line in lines[1:]:
+                if len(chunks[-1]) + 1 + len(line) > MAX_MESSAGE_LENGTH:
+                    chunks.append(line)
+                else:
+                    chunks[-1] += "\n" + line
+            messages[channel_id] = chunks
+        return messages
 
-    @tasks.loop(seconds=30.0)
+    @tasks.loop(seconds=COALESCE_WINDOW)
     async def check_reminders(self):
+        # Everything that became due since the last tick shares one message per channel;
+        # reminders in guilds whose shard isn't ready yet wait for a later tick
         now_ts = int(time())
-        to_fire = [r for r in self.reminders if r["remind_ts"] <= now_ts]
-        for rem in to_fire:
-            chan = self.bot.get_channel(rem["channel_id"])
-            if chan:
-                await chan.send(f"{rem['mentions']} {rem['reminder_name']} reminder!")
-            self.reminders.remove(rem)
-        if to_fire:
-            self._save_reminders()
+        to_fire = [
+            r for r in self.reminders
+            if r["remind_ts"] <= now_ts and sharding.owns_channel(self.bot, r["channel_id"], r.get("guild_id"))
+        ]
+        if not to_fire:
+            return
+
+        for channel_id, chunks in self._coalesce(to_fire).items():
+            chan = self.bot.get_channel(channel_id)
+            if not chan:
+                continue
+            try:
+                for content in chunks:
+                    await chan.send(content)
+            except discord.HTTPException as e:
+                # Dropped like the rest: retrying would ping the channels already sent to again
+                print(f"Failed to send quest reminders in channel {channel_id}: {e}")
+
+        fired = {id(r) for r in to_fire}
+        self.reminders = [r for r in self.reminders if id(r) not in fired]
+        self._save_reminders()
 
     @check_reminders.before_loop
     async def before_check(self):
-        await self.bot.wait_until_ready()
+        await sharding.wait_for_first_shard(self.bot)
 
     @app_commands.command(
         name="quest_reminder",
@@ -132,6 +187,7 @@ class ReminderCog(commands.Cog):
                 continue
             self.reminders.append({
                 "remind_ts": rem_ts,
+                "guild_id": interaction.guild_id,
                 "channel_id": interaction.channel_id,
                 "mentions": mention_str,
                 "reminder_name": c.name
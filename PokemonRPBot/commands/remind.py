@@ -1,24 +1,34 @@
 import discord
 from discord import app_commands
 from discord.ext import commands, tasks
+import asyncio
 import json
 import re
+from collections import deque
 from datetime import datetime, timedelta
 
+import metrics
+import sharding
+
+# Shard workers keep one file per shard instead, see sharding.store_paths
 REMINDERS_FILE = "reminders.json"
+# Reminder sends in flight at once, across all channels. discord.py already waits out each channel's
+# rate limit; this keeps a burst of due reminders from opening a request per reminder at the same time
+MAX_CONCURRENT_SENDS = 5
+LATENCY_HISTORY_SIZE = 500
 
 # Functions to load and save reminders
-def load_reminders():
+def load_reminders(path=REMINDERS_FILE):
     try:
-        with open(REMINDERS_FILE, "r") as f:
+        with open(path, "r") as f:
             return json.load(f)
     except FileNotFoundError:
         return {}
     except json.JSONDecodeError:
         return {}
 
-def save_reminders(reminders):
-    with open(REMINDERS_FILE, "w") as f:
+def save_reminders(reminders, path=REMINDERS_FILE):
+    with open(path, "w") as f:
         json.dump(reminders, f)
 
 # Function to parse time strings
@@ -58,9 +68,15 @@ def parse_time_string(time_str):
 class ReminderCommand(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.reminders = load_reminders()
+        self.reminders = sharding.load_store(bot, REMINDERS_FILE, load_reminders)
+        self.send_semaphore = asyncio.Semaphore(MAX_CONCURRENT_SENDS)
+        # Seconds between each reminder's due time and its delivery (most recent last)
+        self.delivery_latencies = deque(maxlen=LATENCY_HISTORY_SIZE)
         self.check_reminders.start()
 
+    def save(self):
+        sharding.save_store(self.bot, REMINDERS_FILE, self.reminders, save_reminders)
+
     @app_commands.command(name="remind", description="Set a reminder to notify you after a specific time.")
     @app_commands.describe(
         time="The duration until the reminder, e.g., '10 minutes', '2h', or '1h 30m'. No negatives or zero.",
@@ -93,18 +109,19 @@ class ReminderCommand(commands.Cog):
             reminder_id = str(interaction.id)
             self.reminders[reminder_id] = {
                 "user_id": interaction.user.id,
+                "guild_id": interaction.guild_id,
                 "channel_id": interaction.channel_id,
                 "remind_time": remind_time.isoformat(),
                 "message": message,
                 "bot_message_id": None
             }
-            save_reminders(self.reminders)
+            self.save()
 
             # Respond to the user and save bot message ID
             await interaction.response.send_message(f"Got it! I'll remind you in {time}.")
             bot_message = await interaction.original_response()
             self.reminders[reminder_id]["bot_message_id"] = bot_message.id
-            save_reminders(self.reminders)
+            self.save()
 
         except ValueError:
             await interaction.response.send_message(
@@ -116,41 +133,67 @@ class ReminderCommand(commands.Cog):
     async def check_reminders(self):
         """
         Periodically checks reminders and sends notifications when due.
+        Due reminders are delivered concurrently, bounded by the send semaphore.
+        Only reminders in guilds whose shard is ready are sent; the rest wait for a later tick.
         """
         now = datetime.utcnow()
-        reminders_to_delete = []
-
-        for reminder_id, reminder in self.reminders.items():
-            remind_time = datetime.fromisoformat(reminder["remind_time"])
-            if now >= remind_time:
-                # Time to remind the user
-                channel = self.bot.get_channel(reminder["channel_id"])
-                if channel:
-                    try:
-                        user = await self.bot.fetch_user(reminder["user_id"])
-                        if user:
-                            bot_message_id = reminder.get("bot_message_id")
-                            if bot_message_id:
-                                bot_message = await channel.fetch_message(bot_message_id)
-                                await bot_message.reply(
-                                    content=f"⏰ Reminder for {user.mention}: {reminder['message']}"
-                                )
-                    except discord.NotFound:
-                        pass
-                reminders_to_delete.append(reminder_id)
+        due = [
+            (reminder_id, reminder) for reminder_id, reminder in self.reminders.items()
+            if now >= datetime.fromisoformat(reminder["remind_time"])
+            and sharding.owns_channel(self.bot, reminder["channel_id"], reminder.get("guild_id"))
+        ]
+        if not due:
+            return
+
+        # An unexpected error in one delivery must not stop the tick before the delivered ones are saved
+        results = await asyncio.gather(*(self.deliver_reminder(reminder) for _, reminder in due), return_exceptions=True)
+        for (reminder_id, _), result in zip(due, results):
+            if isinstance(result, Exception):
+                print(f"Failed to deliver reminder {reminder_id}: {result!r}")
 
         # Clean up reminders
-        for reminder_id in reminders_to_delete:
+        for reminder_id, _ in due:
             del self.reminders[reminder_id]
-        if reminders_to_delete:
-            save_reminders(self.reminders)
+        self.save()
+
+    async def deliver_reminder(self, reminder):
+        """
+        Sends a single reminder, resolving the channel from the cache first and
+        replying by message reference so the original message never has to be fetched.
+        """
+        channel = self.bot.get_channel(reminder["channel_id"])
+        async with self.send_semaphore:
+            try:
+                if channel is None:
+                    channel = await self.bot.fetch_channel(reminder["channel_id"])
+                content = f"⏰ Reminder for <@{reminder['user_id']}>: {reminder['message']}"
+                bot_message_id = reminder.get("bot_message_id")
+                if bot_message_id:
+                    reference = discord.MessageReference(
+                        message_id=bot_message_id,
+                        channel_id=channel.id,
+                        fail_if_not_exists=False
+                    )
+                    await channel.send(content=content, reference=reference)
+                else:
+                    await channel.send(content=content)
+            except (discord.NotFound, discord.Forbidden):
+                return
+            except discord.HTTPException as e:
+                print(f"Failed to deliver reminder in channel {reminder['channel_id']}: {e}")
+                return
+
+        # Delay between the scheduled time and the actual delivery
+        latency = (datetime.utcnow() - datetime.fromisoformat(reminder["remind_time"])).total_seconds()
+        self.delivery_latencies.append(latency)
+        metrics.registry.observe("bot_reminder_delivery_lag_seconds", max(latency, 0.0))
 
     @check_reminders.before_loop
     async def before_check_reminders(self):
         """
-        Waits until the bot is ready before starting the reminder loop.
+        Waits until the first shard is ready before starting the reminder loop.
         """
-        await self.bot.wait_until_ready()
+        await sharding.wait_for_first_shard(self.bot)
 
 # Setup function to load the cog
 async def setup(bot):
@@ -3,6 +3,80 @@ from discord import app_commands
 from discord.ext import commands
 import random
 import asyncio
+import time
+
+# Reels move one number every REEL_TICK seconds, no matter how often the message is edited
+# (0.3s keeps the per-frame jump coprime with the 10 numbers at the default frame rate)
+REEL_TICK = 0.3
+# Message edits share a bucket of 5 per 5 seconds per channel
+MIN_FRAME_INTERVAL = 1.0
+# Wait used when Discord answers 429 without saying for how long
+DEFAULT_RETRY_AFTER = 5.0
+MAX_SPIN_SECONDS = 60
+FINAL_FRAME_ATTEMPTS = 3
+MAX_CONCURRENT_SPINS = 3
+
+# Caps how many animations run across the whole bot
+ANIMATION_SLOTS = asyncio.Semaphore(MAX_CONCURRENT_SPINS)
+
+def retry_after(error: Exception) -> float:
+    """
+    Seconds Discord asked us to wait before the next edit: from discord.RateLimited, or from the
+    Retry-After / X-RateLimit-Reset-After headers of a 429. 0 for errors that aren't rate limits.
+    """
+    if isinstance(error, discord.RateLimited):
+        return error.retry_after
+    if getattr(error, "status", None) != 429:
+        return 0.0
+    headers = getattr(error.response, "headers", None) or {}
+    for header in ("Retry-After", "X-RateLimit-Reset-After"):
+        try:
+            return float(headers[header])
+        except (KeyError, TypeError, ValueError):
+            continue
+    return DEFAULT_RETRY_AFTER
+
+class FrameScheduler:
+    """
+    Paces the edits of one animated message.
+    Frames go out at most every MIN_FRAME_INTERVAL seconds. discord.py already holds an edit back while
+    the rate limit headers say the bucket is empty, and since each edit is awaited the frames that would
+    have been sent meanwhile are skipped, never queued. When an edit is rate limited anyway, the next
+    frame waits for the retry_after Discord sent.
+    """
+
+    def __init__(self):
+        self.next_frame = time.monotonic()
+
+    async def wait_for_next_frame(self):
+        delay = self.next_frame - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def record(self, wait: float = 0.0):
+        """Schedule the next frame, at least 'wait' seconds from now."""
+        self.next_frame = time.monotonic() + max(MIN_FRAME_INTERVAL, wait)
+
+    async def send_frame(self, edit):
+        """Send one intermediate frame; a frame that fails is dropped."""
+        try:
+            await edit
+        except (discord.HTTPException, discord.RateLimited) as e:
+            self.record(retry_after(e))
+            return
+        self.record()
+
+    async def send_final_frame(self, make_edit):
+        """The last frame has to arrive, so it is retried instead of skipped."""
+        for attempt in range(FINAL_FRAME_ATTEMPTS):
+            await self.wait_for_next_frame()
+            try:
+                await make_edit()
+                return
+            except (discord.HTTPException, discord.RateLimited) as e:
+                if attempt == FINAL_FRAME_ATTEMPTS - 1:
+                    raise
+                self.record(retry_after(e) or DEFAULT_RETRY_AFTER)
 
 class SlotMachineCommand(commands.Cog):
     def __init__(self, bot):
@@ -15,25 +89,43 @@ class SlotMachineCommand(commands.Cog):
         positions = [0, 0, 0]  # Current positions in each column
         stopped = [False, False, False]  # Tracks whether each column has stopped
 
-        # Send the initial message with buttons
-        view = SlotMachineView(bars, positions, stopped)
-        await interaction.response.send_message(
-            content=self.render_grid(bars, positions, spinning=True), view=view
-        )
-
-        # Animation loop
-        message = await interaction.original_response()
-        while not all(stopped):
-            for i in range(3):
-                if not stopped[i]:
-                    positions[i] = (positions[i] + 1) % 10  # Cycle through numbers
-            await message.edit(content=self.render_grid(bars, positions, spinning=True), view=view)
-            await asyncio.sleep(0.2)  # Control animation speed
-
-        # Final result
-        await message.edit(content=self.render_grid(bars, positions, spinning=False), view=None)
-        result = "🎉 You win!" if self.check_win(bars, positions) else "Better luck next time!"
-        await interaction.followup.send(result)
+        if ANIMATION_SLOTS.locked():
+            await interaction.response.send_message(
+                "Too many slot machines are spinning right now, try again in a moment!", ephemeral=True
+            )
+            return
+
+        async with ANIMATION_SLOTS:
+            # Send the initial message with buttons
+            view = SlotMachineView(bars, positions, stopped)
+            await interaction.response.send_message(
+                content=self.render_grid(bars, positions, spinning=True), view=view
+            )
+
+            # Animation loop: the reels advance with wall time, only the latest frame gets sent
+            message = await interaction.original_response()
+            scheduler = FrameScheduler()
+            started = last_tick = time.monotonic()
+            while not all(stopped):
+                await scheduler.wait_for_next_frame()
+                now = time.monotonic()
+                steps = max(1, int((now - last_tick) / REEL_TICK))
+                last_tick = now
+                for i in range(3):
+                    if not stopped[i]:
+                        positions[i] = (positions[i] + steps) % 10  # Cycle through numbers
+                if now - started > MAX_SPIN_SECONDS:
+                    stopped[:] = [True, True, True]
+                    break
+                await scheduler.send_frame(message.edit(content=self.render_grid(bars, positions, spinning=True), view=view))
+
+            # Final result, retried so the end state always lands
+            view.stop()
+            await scheduler.send_final_frame(
+                lambda: message.edit(content=self.render_grid(bars, positions, spinning=False), view=None)
+            )
+            result = "🎉 You win!" if self.check_win(bars, positions) else "Better luck next time!"
+            await interaction.followup.send(result)
 
     def generate_shuffled_numbers(self, seed):
         """Generate a shuffled list of numbers from 0 to 9."""
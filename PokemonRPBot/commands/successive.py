@@ -5,6 +5,8 @@ from helpers import ParsedRollQuery
 import re
 import logging
 
+from view_lifecycle import ExpiringView
+
 # Configure logging
 logger = logging.getLogger('discord.successive')
 logger.setLevel(logging.DEBUG)
@@ -12,9 +14,9 @@ handler = logging.FileHandler(filename='successive_debug.log', encoding='utf-8',
 handler.setFormatter(logging.Formatter('%(asctime)s:%(levelname)s:%(name)s: %(message)s'))
 logger.addHandler(handler)
 
-class SuccessiveRollView(discord.ui.View):
+class SuccessiveRollView(ExpiringView):
     def __init__(self, bot, query, required_successes, total_successes, total_rolls, accuracy=0, has_rerolled=False):
-        super().__init__(timeout=None)
+        super().__init__()
         self.bot = bot
         self.query = query
         self.required_successes = required_successes
@@ -130,6 +132,8 @@ class SuccessiveRollView(discord.ui.View):
 
         # Send the reroll result directly as a response to the button interaction
         await interaction.response.send_message(content=reroll_output)
+        # Only one reroll per roll, so the button is done
+        await self.expire(interaction.message)
 
 class SuccessiveCommand(commands.Cog):
     def __init__(self, bot):
@@ -201,7 +205,7 @@ class SuccessiveCommand(commands.Cog):
                 total_rolls=[],
                 accuracy=accuracy
             )
-            await interaction.response.send_message(content=output, view=view)
+            await view.send(interaction, content=output)
         else:
             await interaction.response.send_message(content=output)
 
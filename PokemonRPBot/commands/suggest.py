@@ -8,7 +8,6 @@ from pathlib import Path
 import discord
 from discord import app_commands
 from discord.ext import commands
-from openai import OpenAI
 
 logger = logging.getLogger(__name__)
 
@@ -108,12 +107,20 @@ Generate a quest idea based on these parameters.
 
     def __init__(self, bot: commands.Bot):
         self.bot = bot
-        self.client = OpenAI(
-            base_url="http://localhost:1234/v1",
-            api_key="lm-studio"
-        )
+        self._client = None
         self.model = "your-model-identifier"
 
+    @property
+    def client(self):
+        """The OpenAI client, created (and the openai package imported) on first use."""
+        if self._client is None:
+            from openai import OpenAI
+            self._client = OpenAI(
+                base_url="http://localhost:1234/v1",
+                api_key="lm-studio"
+            )
+        return self._client
+
     def load_user_characters(self, user_id: int) -> list[dict]:
         path = self.DATA_FOLDER / f"{user_id}.json"
         if not path.exists():
@@ -34,22 +34,33 @@ def save_offsets(offsets: Dict[str, List[int]]):
     with open(OFFSET_FILE, "w", encoding="utf-8") as f:
         json.dump(offsets, f)
 
+# In-memory copy of user_offsets.json, loaded on first use and written through on change
+_offsets: Optional[Dict[str, List[int]]] = None
+
+def get_offsets() -> Dict[str, List[int]]:
+    """
+    Return the in-memory offsets dict, reading user_offsets.json only the first time.
+    """
+    global _offsets
+    if _offsets is None:
+        _offsets = load_offsets()
+    return _offsets
+
 async def get_user_offset(user_id: int) -> Optional[Tuple[int, int]]:
     """
     Return (hours, minutes) if found for the user, else None.
     We'll store user_id as a string in the JSON.
     """
-    offsets = load_offsets()
-    data = offsets.get(str(user_id))
+    data = get_offsets().get(str(user_id))
     if data and len(data) == 2:
         return (data[0], data[1])
     return None
 
 async def set_user_offset(user_id: int, hours: int, minutes: int):
     """
-    Save the user's offset as [hours, minutes] in user_offsets.json.
+    Save the user's offset as [hours, minutes] in memory and in user_offsets.json.
     """
-    offsets = load_offsets()
+    offsets = get_offsets()
     offsets[str(user_id)] = [hours, minutes]
     save_offsets(offsets)
 
@@ -1,34 +1,15 @@
 from __future__ import annotations
 import re
-import json
-import os
 from datetime import datetime, timedelta
-from typing import Optional, Dict, List, Tuple
 
 import discord
 from discord.ext import commands
 
-# --------------------------------------------------------------------------------
-# OFFSET STORAGE FUNCTIONS (reuse these from your other module)
-# --------------------------------------------------------------------------------
-OFFSET_FILE = "user_offsets.json"
-
-def load_offsets() -> Dict[str, List[int]]:
-    if not os.path.exists(OFFSET_FILE):
-        return {}
-    try:
-        with open(OFFSET_FILE, "r", encoding="utf-8") as f:
-            data = json.load(f)
-            return data if isinstance(data, dict) else {}
-    except (json.JSONDecodeError, IOError):
-        return {}
+from commands.timestamp import get_user_offset  # In-memory offsets shared with /timestamp
+from message_pipeline import pipeline
 
-async def get_user_offset(user_id: int) -> Optional[Tuple[int, int]]:
-    offsets = load_offsets()
-    data = offsets.get(str(user_id))
-    if data and len(data) == 2:
-        return (data[0], data[1])
-    return None
+# Look for a pattern like "ts:18:00" anywhere in the message.
+TIMESTAMP_PATTERN = re.compile(r"\bts:(\d{1,2}):(\d{2})\b")
 
 # --------------------------------------------------------------------------------
 # HELPER FUNCTION: Build "local now" from stored offset
@@ -44,18 +25,13 @@ class TimestampTracker(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
 
-    @commands.Cog.listener()
-    async def on_message(self, message: discord.Message):
-        # Ignore messages from bots.
-        if message.author.bot:
-            return
+    async def cog_load(self):
+        pipeline.register("timestamp_tracker", TIMESTAMP_PATTERN, self.on_timestamp)
 
-        # Look for a pattern like "ts:18:00" anywhere in the message.
-        pattern = r"\bts:(\d{1,2}):(\d{2})\b"
-        match = re.search(pattern, message.content)
-        if not match:
-            return
+    async def cog_unload(self):
+        pipeline.unregister("timestamp_tracker")
 
+    async def on_timestamp(self, message: discord.Message, match: re.Match):
         hour_str, minute_str = match.groups()
         try:
             hour = int(hour_str)
@@ -92,8 +68,6 @@ class TimestampTracker(commands.Cog):
         )
 
         await message.channel.send(response)
-        # Ensure commands still work if this message also invoked one.
-        await self.bot.process_commands(message)
 
 async def setup(bot: commands.Bot):
     await bot.add_cog(TimestampTracker(bot))
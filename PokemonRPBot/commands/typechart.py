@@ -5,8 +5,10 @@ import json
 import math
 import os
 import re
+from functools import lru_cache
 
 # Import only the functions needed from your custom emojis file.
+import startup_profiler
 from emojis import get_type_emoji
 
 def load_defensive_chart():
@@ -19,17 +21,20 @@ def load_defensive_chart():
     with open(file_path, "r", encoding="utf-8") as f:
         return json.load(f)
 
-# Load the defensive chart once when the cog is loaded.
-DEFENSIVE_CHART = load_defensive_chart()
+@lru_cache(maxsize=None)
+def get_defensive_chart() -> dict:
+    """Load the defensive chart once, the first time a command needs it."""
+    with startup_profiler.phase("data", "typechart defensive chart"):
+        return load_defensive_chart()
 
 def normalize_type(t: str) -> str:
     """
-    Normalize the input type string to match one of the keys in DEFENSIVE_CHART.
+    Normalize the input type string to match one of the keys in the defensive chart.
     This function compares the lowercase of the input to the lowercase of each key
     and returns the properly cased key if found. Otherwise, it returns the input.
     """
     t_normalized = t.lower()
-    for key in DEFENSIVE_CHART.keys():
+    for key in get_defensive_chart().keys():
         if key.lower() == t_normalized:
             return key
     return t
@@ -106,11 +111,12 @@ class TypeInteractionsCog(commands.Cog):
                 defender_types.append(normalize_type(t))
 
         # Calculate overall effectiveness for each attacking type.
+        chart = get_defensive_chart()
         results = {}
-        for attack_type in DEFENSIVE_CHART.keys():
+        for attack_type in chart.keys():
             multiplier = 1.0
             for def_type in defender_types:
-                multiplier *= DEFENSIVE_CHART[def_type][attack_type]
+                multiplier *= chart[def_type][attack_type]
             if multiplier == 1:
                 continue
             category = get_effectiveness_category(multiplier)
@@ -141,7 +147,7 @@ class TypeInteractionsCog(commands.Cog):
     async def type1_autocomplete(self, interaction: discord.Interaction, current: str):
         return [
             app_commands.Choice(name=t, value=t)
-            for t in sorted(DEFENSIVE_CHART.keys())
+            for t in sorted(get_defensive_chart().keys())
             if current.lower() in t.lower()
         ][:25]
 
@@ -149,7 +155,7 @@ class TypeInteractionsCog(commands.Cog):
     async def type2_autocomplete(self, interaction: discord.Interaction, current: str):
         return [
             app_commands.Choice(name=t, value=t)
-            for t in sorted(DEFENSIVE_CHART.keys())
+            for t in sorted(get_defensive_chart().keys())
             if current.lower() in t.lower()
         ][:25]
 
@@ -157,7 +163,7 @@ class TypeInteractionsCog(commands.Cog):
     async def type3_autocomplete(self, interaction: discord.Interaction, current: str):
         return [
             app_commands.Choice(name=t, value=t)
-            for t in sorted(DEFENSIVE_CHART.keys())
+            for t in sorted(get_defensive_chart().keys())
             if current.lower() in t.lower()
         ][:25]
 
@@ -165,7 +171,7 @@ class TypeInteractionsCog(commands.Cog):
     async def type4_autocomplete(self, interaction: discord.Interaction, current: str):
         return [
             app_commands.Choice(name=t, value=t)
-            for t in sorted(DEFENSIVE_CHART.keys())
+            for t in sorted(get_defensive_chart().keys())
             if current.lower() in t.lower()
         ][:25]
 
@@ -2,78 +2,148 @@ import discord
 from discord.ext import commands, tasks
 from discord import app_commands
 from datetime import datetime, timedelta
+from collections import Counter, defaultdict
+import asyncio
+import heapq
+import itertools
 import json
 import os
 
+# How long each kind of warning counts towards the next step; bans never expire
+EXPIRY = {"Warning": timedelta(weeks=1), "Timeout": timedelta(weeks=2)}
+# Expired warnings dropped per step of the background purge before yielding to the event loop
+PURGE_BATCH = 500
+
 class WarningCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.warnings_file = "warnings.json"
         self.user_warnings = self.load_warnings()
+        # user id -> counts of their active warnings by type
+        self.warning_counts = defaultdict(Counter)
+        # (expires at, tie breaker, user id, warning) for every warning that expires, soonest first
+        self.expiry_heap = []
+        self.sequence = itertools.count()
+        self.dirty = False
+        for user_id, warnings in self.user_warnings.items():
+            for warning in warnings:
+                self.index_warning(user_id, warning)
+        self.purge_expired()
+        self.clean_expired_warnings.start()
+
+    def cog_unload(self):
+        self.clean_expired_warnings.cancel()
+
+    @property
+    def journal_file(self):
+        # Changes since warnings.json was last written, one JSON object per line
+        return f"{os.path.splitext(self.warnings_file)[0]}.journal.jsonl"
 
     def load_warnings(self):
+        warnings = {}
         if os.path.exists(self.warnings_file):
             with open(self.warnings_file, "r") as file:
-                return json.load(file)
-        return {}
+                warnings = json.load(file)
+        if os.path.exists(self.journal_file):
+            with open(self.journal_file, "r") as file:
+                for line in file:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # A line cut short by a crash
+                        continue
+                    if entry["op"] == "clear":
+                        warnings.pop(entry["user_id"], None)
+                    elif entry["op"] == "add":
+                        user_warnings = warnings.setdefault(entry["user_id"], [])
+                        # Already there if the bot stopped between writing warnings.json and starting a new journal
+                        if entry["warning"] not in user_warnings:
+                            user_warnings.append(entry["warning"])
+        return warnings
 
     def save_warnings(self):
-        with open(self.warnings_file, "w") as file:
+        """Write every warning to warnings.json and start a new journal."""
+        temporary = f"{self.warnings_file}.tmp"
+        with open(temporary, "w") as file:
             json.dump(self.user_warnings, file, default=str)
+        os.replace(temporary, self.warnings_file)
+        if os.path.exists(self.journal_file):
+            os.remove(self.journal_file)
+        self.dirty = False
+
+    def append_journal(self, entry):
+        with open(self.journal_file, "a") as file:
+            file.write(json.dumps(entry) + "\n")
+        self.dirty = True
+
+    def index_warning(self, user_id, warning):
+        self.warning_counts[user_id][warning["type"]] += 1
+        expiry = EXPIRY.get(warning["type"])
+        if expiry is not None:
+            expires_at = datetime.fromisoformat(warning["timestamp"]) + expiry
+            heapq.heappush(self.expiry_heap, (expires_at, next(self.sequence), user_id, warning))
+
+    def add_warning(self, user_id, warning_type, now):
+        warning = {"type": warning_type, "timestamp": now.isoformat()}
+        self.user_warnings.setdefault(user_id, []).append(warning)
+        self.index_warning(user_id, warning)
+        self.append_journal({"op": "add", "user_id": user_id, "warning": warning})
+
+    def purge_expired(self, limit=None):
+        """Drop warnings that have expired, soonest first, at most limit of them. Returns how many were dropped."""
+        now = datetime.utcnow()
+        purged = 0
+        while self.expiry_heap and self.expiry_heap[0][0] < now and (limit is None or purged < limit):
+            _, _, user_id, warning = heapq.heappop(self.expiry_heap)
+            purged += 1
+            warnings = self.user_warnings.get(user_id, [])
+            # Cleared warnings stay in the heap until they come up, and are skipped then
+            for i, candidate in enumerate(warnings):
+                if candidate is warning:
+                    del warnings[i]
+                    self.warning_counts[user_id][warning["type"]] -= 1
+                    self.dirty = True
+                    break
+            if user_id in self.user_warnings and not warnings:
+                del self.user_warnings[user_id]
+                self.warning_counts.pop(user_id, None)
+        return purged
 
     async def warn_user(self, user, interaction, message_id):
         user_id = str(user.id)
         now = datetime.utcnow()
 
-        if user_id not in self.user_warnings:
-            self.user_warnings[user_id] = []
-
         # Remove expired warnings
-        self.user_warnings[user_id] = [w for w in self.user_warnings[user_id] if not self.is_warning_expired(w)]
+        self.purge_expired()
 
         # Count existing warnings
-        warning_count = len([w for w in self.user_warnings[user_id] if w["type"] == "Warning"])
-        timeout_count = len([w for w in self.user_warnings[user_id] if w["type"] == "Timeout"])
+        warning_count = self.warning_counts[user_id]["Warning"]
+        timeout_count = self.warning_counts[user_id]["Timeout"]
 
         if warning_count < 1:
             warning_type = "Warning"
-            self.user_warnings[user_id].append({"type": warning_type, "timestamp": now.isoformat()})
+            self.add_warning(user_id, warning_type, now)
             response = f"{user.mention}, this is your first warning for inappropriate behavior. Please stop that."
         elif timeout_count < 1:
             warning_type = "Timeout"
-            self.user_warnings[user_id].append({"type": warning_type, "timestamp": now.isoformat()})
+            self.add_warning(user_id, warning_type, now)
             await user.timeout(timedelta(days=1))
             response = f"{user.mention}, you have been timed out for 1 day due to repeated warnings."
         elif timeout_count < 2:
             warning_type = "Timeout"
-            self.user_warnings[user_id].append({"type": warning_type, "timestamp": now.isoformat()})
+            self.add_warning(user_id, warning_type, now)
             await user.timeout(timedelta(weeks=1))
             response = f"{user.mention}, you have been timed out for 1 week due to continued inappropriate behavior."
         else:
             warning_type = "Ban"
-            self.user_warnings[user_id].append({"type": warning_type, "timestamp": now.isoformat()})
+            self.add_warning(user_id, warning_type, now)
             await interaction.guild.ban(user, reason="Repeated violations of server rules.")
             response = f"{user.mention} has been banned for repeated violations, but their warning history will be retained."
 
-        self.save_warnings()
-
         channel = interaction.channel
         if channel:
             await channel.send(f"Warning issued for [message](https://discord.com/channels/{interaction.guild_id}/{channel.id}/{message_id}): {response}")
 
-    def is_warning_expired(self, warning):
-        warning_type = warning["type"]
-        timestamp = datetime.fromisoformat(warning["timestamp"])
-        now = datetime.utcnow()
-
-        if warning_type == "Warning":
-            return now > timestamp + timedelta(weeks=1)
-        elif warning_type == "Timeout":
-            return now > timestamp + timedelta(weeks=2)
-        elif warning_type == "Ban":
-            return False
-        return False
-
     @app_commands.command(name="warn", description="Warn a user for inappropriate behavior.")
     @app_commands.checks.has_permissions(administrator=True)
     async def warn(self, interaction: discord.Interaction, user: discord.Member, message_id: str):
@@ -84,35 +154,31 @@ class WarningCog(commands.Cog):
     async def clear_warnings(self, interaction: discord.Interaction, user: discord.Member):
         user_id = str(user.id)
         if user_id in self.user_warnings:
-            self.user_warnings[user_id] = []
-            self.save_warnings()
+            del self.user_warnings[user_id]
+            self.warning_counts.pop(user_id, None)
+            self.append_journal({"op": "clear", "user_id": user_id})
             await interaction.channel.send(f"All warnings for {user.mention} have been cleared.")
         else:
             await interaction.channel.send(f"{user.mention} has no warnings.")
 
-    @tasks.loop(hours=24)
+    @tasks.loop(hours=1)
     async def clean_expired_warnings(self):
-        """Clean up expired warnings regularly."""
-        for user_id in list(self.user_warnings.keys()):
-            self.user_warnings[user_id] = [w for w in self.user_warnings[user_id] if not self.is_warning_expired(w)]
-            if not self.user_warnings[user_id]:
-                del self.user_warnings[user_id]
-        self.save_warnings()
+        """Purge expired warnings in batches, then fold the journal into warnings.json."""
+        while self.purge_expired(PURGE_BATCH) == PURGE_BATCH:
+            await asyncio.sleep(0)
+        if self.dirty:
+            self.save_warnings()
 
     @app_commands.command(name="warnings", description="Check a user's warning levels.")
     async def warnings(self, interaction: discord.Interaction, user: discord.Member):
         user_id = str(user.id)
+        self.purge_expired()
         if user_id in self.user_warnings:
-            warning_count = len([w for w in self.user_warnings[user_id] if w["type"] == "Warning"])
-            timeout_count = len([w for w in self.user_warnings[user_id] if w["type"] == "Timeout"])
+            warning_count = self.warning_counts[user_id]["Warning"]
+            timeout_count = self.warning_counts[user_id]["Timeout"]
             await interaction.channel.send(f"{user.mention} has {warning_count} warnings and {timeout_count} timeouts.")
         else:
             await interaction.channel.send(f"{user.mention} has no warnings.")
 
-    @commands.Cog.listener()
-    async def on_ready(self):
-        guilds = await self.bot.tree.sync()
-        print(f"Synced slash commands to {len(guilds)} guild(s).")
-
 async def setup(bot):
     await bot.add_cog(WarningCog(bot))
@@ -29,7 +29,8 @@ COMMANDS = [
     "commands.z_move",
     "commands.switch",
     "commands.quest_reminder",
-    "commands.gm_time"
+    "commands.gm_time",
+    "commands.debug"
     ]
 
 COMMANDS_NOT_LOADED = [
@@ -37,4 +38,40 @@ COMMANDS_NOT_LOADED = [
     "commands.create_character",
     "commands.edit_questgiver",
     "commands.setup_questgiver",
-]
\ No newline at end of file
+]
+
+# Discord user ID allowed to use the /debug commands
+OWNER_ID = 307627785818603523
+
+# Record import, extension and data load timings at startup (see /debug startup). Installs an import
+# hook and runs tracemalloc, so only turn it on while profiling (or set POKEMONRPBOT_PROFILE_STARTUP=1)
+PROFILE_STARTUP = False
+
+# Localhost port serving Prometheus metrics at /metrics (None disables the endpoint)
+METRICS_PORT = 9464
+
+# Seconds a handler may take before its interaction is deferred automatically (None disables)
+DEFERRAL_BUDGET = 2.0
+
+# Opt-in watchdog that records what blocked the event loop for longer than the threshold (see /debug stalls)
+LOOP_WATCHDOG = False
+LOOP_STALL_THRESHOLD = 0.25
+
+# Opt-in allocation tracing for /debug memory (tracemalloc slows allocations and uses extra memory)
+MEMORY_TRACKING = False
+
+# Run as an AutoShardedBot. SHARD_COUNT None lets Discord recommend a count; SHARD_IDS limits this
+# process to some of the shards when they are split over several processes (needs SHARD_COUNT).
+# Only the reminder stores are kept per shard; the other JSON stores still expect a single process
+SHARDING = False
+SHARD_COUNT = None
+SHARD_IDS = None
+
+# "all" caches every member of every guild at login (discord.py's default with the members intent).
+# "lazy" caches no members besides the bot's own; commands look members up through the API instead
+MEMBER_CACHE = "all"
+
+# Seconds the reroll buttons under /successive and /automate_rolls results stay usable without a click,
+# and how many of those messages keep working buttons at once (past that the oldest lose them early)
+ROLL_VIEW_TIMEOUT = 10 * 60
+MAX_ROLL_VIEWS = 1000
@@ -1,6 +1,8 @@
 import os
 import json
 import csv
+import startup_profiler
+from paginator import layout_sections
 
 # Define paths to data folders and CSV files
 POKEMON_NEW_FOLDER = "Data/pokemon_new"
@@ -154,11 +156,19 @@ def load_csv_data():
             if species_id in pokemon_base_data:
                 pokemon_base_data[species_id]["evolves_from"] = evolves_from
 
-# Load all CSV data on import
-load_csv_data()
+_csv_loaded = False
+
+def ensure_csv_data():
+    """Load the CSV data the first time a lookup needs it instead of at import time."""
+    global _csv_loaded
+    if not _csv_loaded:
+        with startup_profiler.phase("data", "data_loader CSV data"):
+            load_csv_data()
+        _csv_loaded = True
 
 def load_pokemon_data(pokemon_name):
     """Loads Pokémon data from JSON files or base CSV, then adds moves."""
+    ensure_csv_data()
     # Find Pokémon ID from base data
     normalized_name = pokemon_name.lower().replace(' ', '-')
     pokemon_id = pokemon_name_to_id_map.get(normalized_name)
@@ -247,6 +257,7 @@ def format_old_data(data):
 
 def get_rank_based_moves(pokemon_id):
     """Retrieve moves by rank from CSV data using the provided Pokémon ID."""
+    ensure_csv_data()
     parsed_moves = {rank: [] for rank in VALID_RANKS}
     parsed_moves["Other"] = []  # Ensure "Other" key is always present
 
@@ -268,6 +279,7 @@ def get_rank_based_moves(pokemon_id):
 
 def get_additional_moves(pokemon_name):
     """Retrieve and format additional moves (TM, Egg, Tutor, and level-up moves) for a Pokémon."""
+    ensure_csv_data()
     # Normalize the input name
     normalized_name = pokemon_name.lower().replace(' ', '-')
     pokemon_id = pokemon_name_to_id_map.get(normalized_name)
@@ -309,51 +321,26 @@ def get_additional_moves(pokemon_name):
                 if move_name not in rank_moves_set:
                     missing_level_up_moves.add(move_name)
 
-    # Build the message
-    messages = []
-    current_message = f"### {pokemon_name.title()} [#{pokemon_id}]\n"
-
     # Adjust the formatting to include double spaces
     separator = "  |  "
 
     # Add each section with appropriate emoji and formatted moves
+    sections = []
     if moves["TM Moves"]:
-        tm_section = "\n:cd: **TM Moves**\n" + separator.join(sorted(moves["TM Moves"]))
-        if len(current_message) + len(tm_section) > 2000:
-            messages.append(current_message)
-            current_message = tm_section
-        else:
-            current_message += tm_section
-
+        sections.append(("TM Moves", ":cd: **TM Moves**\n" + separator.join(sorted(moves["TM Moves"]))))
     if moves["Egg Moves"]:
-        egg_section = "\n\n:egg: **Egg Moves**\n" + separator.join(sorted(moves["Egg Moves"]))
-        if len(current_message) + len(egg_section) > 2000:
-            messages.append(current_message)
-            current_message = egg_section
-        else:
-            current_message += egg_section
-
+        sections.append(("Egg Moves", ":egg: **Egg Moves**\n" + separator.join(sorted(moves["Egg Moves"]))))
     if moves["Tutor Moves"]:
-        tutor_section = "\n\n:teacher: **Tutor Moves**\n" + separator.join(sorted(moves["Tutor Moves"]))
-        if len(current_message) + len(tutor_section) > 2000:
-            messages.append(current_message)
-            current_message = tutor_section
-        else:
-            current_message += tutor_section
-
+        sections.append(("Tutor Moves", ":teacher: **Tutor Moves**\n" + separator.join(sorted(moves["Tutor Moves"]))))
     if missing_level_up_moves:
-        missing_section = "\n\n:question: **Learned in Game through level up, but not here**\n" + separator.join(sorted(missing_level_up_moves))
-        if len(current_message) + len(missing_section) > 2000:
-            messages.append(current_message)
-            current_message = missing_section
-        else:
-            current_message += missing_section
+        sections.append((
+            "Level Up Moves",
+            ":question: **Learned in Game through level up, but not here**\n" + separator.join(sorted(missing_level_up_moves))
+        ))
 
-    # Append the final message
-    if current_message:
-        messages.append(current_message)
-
-    return messages
+    # Lay the sections out into as few messages as possible
+    header = f"### {pokemon_name.title()} [#{pokemon_id}]"
+    return layout_sections(header, sections).pages
 
 
 
@@ -362,6 +349,7 @@ def get_additional_moves(pokemon_name):
 
 def get_evolution_chain(pokemon_id):
     """Retrieve the evolution chain for a given Pokémon ID, with special handling for overrides."""
+    ensure_csv_data()
     if pokemon_id in EVOLUTION_OVERRIDE:
         # Use the override chain directly
         evolution_chain = EVOLUTION_OVERRIDE[pokemon_id] + [pokemon_id]
@@ -383,17 +371,23 @@ def get_evolution_chain(pokemon_id):
 
 
 def reload_data():
-    """Reloads CSV data into memory."""
-    global moves_data, pokemon_moves_data, pokemon_move_methods_data, pokemon_base_data, evolution_chains
+    """Reloads CSV data into memory, and makes the evolution and type chart getters read their files again."""
+    global moves_data, pokemon_moves_data, pokemon_move_methods_data, pokemon_base_data, evolution_chains, _csv_loaded
+    import pokemon_card
+    from commands import typechart
+    for getter in (pokemon_card.get_evolution_data, pokemon_card.get_defensive_chart, typechart.get_defensive_chart):
+        getter.cache_clear()
     moves_data.clear()
     pokemon_moves_data.clear()
     pokemon_move_methods_data.clear()
     pokemon_base_data.clear()
     evolution_chains.clear()
     load_csv_data()
+    _csv_loaded = True
 
 def get_pokemon_moves(pokemon_name):
     """Retrieve and format rank moves for a Pokémon."""
+    ensure_csv_data()
     # Normalize the input name
     normalized_name = pokemon_name.lower().replace(' ', '-')
     pokemon_id = pokemon_name_to_id_map.get(normalized_name)
@@ -405,31 +399,20 @@ def get_pokemon_moves(pokemon_name):
     pokemon_data = load_pokemon_data(pokemon_name)
     specific_moves = pokemon_data.get("moves", {})
 
-    # Build the initial message
-    messages = []
-    current_message = f"### {pokemon_name.title()} [#{pokemon_id}]\n"
-
     # Include rank-based moves from new data
+    sections = []
     if specific_moves:
         for rank in VALID_RANKS:
             rank_moves = specific_moves.get(rank, [])
             if rank_moves:
                 emoji = RANK_EMOJIS.get(rank, "")
-                rank_section = f"\n{emoji} **{rank}**\n" + " | ".join(sorted(rank_moves))
-                if len(current_message) + len(rank_section) > 2000:
-                    messages.append(current_message)
-                    current_message = rank_section
-                else:
-                    current_message += rank_section
+                sections.append((rank, f"{emoji} **{rank}**\n" + " | ".join(sorted(rank_moves))))
     else:
         # Handle Pokémon without new data format (old data or CSV)
-        current_message += "\nNo rank-based moves available."
-
-    # Append the final message
-    if current_message:
-        messages.append(current_message)
+        sections.append(("Moves", "No rank-based moves available."))
 
-    return messages
+    header = f"### {pokemon_name.title()} [#{pokemon_id}]"
+    return layout_sections(header, sections, separator="\n").pages
 
 def parse_stat_range(stat_range):
     """Parse stat range from 'min/max' format in new data."""
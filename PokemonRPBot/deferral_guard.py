@@ -0,0 +1,171 @@
+import asyncio
+import functools
+from collections import Counter
+from contextlib import asynccontextmanager
+
+import discord
+
+import config
+import metrics
+
+# interaction.id -> task deferring it; resolves to True once the deferral went through
+_deferrals = {}
+# Handler name -> how many times the guard had to step in
+auto_deferred = Counter()
+# Undecorated InteractionResponse methods, so the guard's own defer isn't rerouted
+_originals = {}
+# interaction.id -> whether the guard's "thinking..." message is ephemeral (commands and modals only)
+_thinking = {}
+# interaction.id -> handler name, while the guard is watching it
+_watched = {}
+# Handler name -> whether its latest send_message was ephemeral
+_replied_ephemerally = {}
+
+
+def _replies_ephemerally(interaction: discord.Interaction, handler: str) -> bool:
+    """
+    Whether to defer privately: extras={"ephemeral": ...} on the command if it says, else the way the
+    handler last answered. A handler seen for the first time is deferred publicly.
+    """
+    command = interaction.command
+    extras = getattr(command, "extras", None) or {}
+    if "ephemeral" in extras:
+        return bool(extras["ephemeral"])
+    return _replied_ephemerally.get(handler, False)
+
+
+async def _defer(interaction: discord.Interaction, kind: str, handler: str) -> bool:
+    ephemeral = kind != "component" and _replies_ephemerally(interaction, handler)
+    try:
+        # Components get a silent "update" deferral; commands and modals show "thinking..."
+        await _originals["defer"](interaction.response, thinking=kind != "component", ephemeral=ephemeral)
+    except (discord.InteractionResponded, discord.HTTPException):
+        # The handler's own response got there first
+        return False
+    if kind != "component":
+        _thinking[interaction.id] = ephemeral
+    auto_deferred[handler] += 1
+    metrics.registry.inc("bot_interaction_auto_deferrals_total", kind=kind, handler=handler)
+    print(f"[deferral guard] {handler} had not responded after {config.DEFERRAL_BUDGET}s, deferred it")
+    return True
+
+
+def _start_deferral(interaction: discord.Interaction, kind: str, handler: str):
+    if interaction.response.is_done():
+        return
+    _deferrals[interaction.id] = asyncio.create_task(_defer(interaction, kind, handler))
+
+
+@asynccontextmanager
+async def guard(interaction: discord.Interaction, kind: str, handler: str):
+    """Defer the interaction if the handler hasn't responded within config.DEFERRAL_BUDGET seconds."""
+    # Autocomplete can't be deferred, it has to answer with choices
+    if config.DEFERRAL_BUDGET is None or kind == "autocomplete":
+        yield
+        return
+
+    timer = asyncio.get_running_loop().call_later(config.DEFERRAL_BUDGET, _start_deferral, interaction, kind, handler)
+    _watched[interaction.id] = handler
+    try:
+        yield
+    finally:
+        timer.cancel()
+        _deferrals.pop(interaction.id, None)
+        _thinking.pop(interaction.id, None)
+        _watched.pop(interaction.id, None)
+
+
+class RerouteResponse:
+    """
+    What a rerouted send_message/edit_message returns, in place of the InteractionCallbackResponse
+    the original call would have: message_id and resource point at the message that was sent or edited.
+    """
+
+    def __init__(self, interaction: discord.Interaction, type: discord.InteractionResponseType,
+                 message: discord.WebhookMessage, ephemeral: bool = False):
+        self.id = interaction.id
+        self.type = type
+        self.message_id = message.id
+        self.activity_id = None
+        self.resource = message
+        self._ephemeral = ephemeral
+
+    def is_thinking(self) -> bool:
+        return False
+
+    def is_ephemeral(self) -> bool:
+        return self._ephemeral
+
+
+async def _send_as_followup(interaction: discord.Interaction, content=None, *, delete_after=None, ephemeral=False,
+                            **kwargs):
+    thinking_ephemeral = _thinking.get(interaction.id)
+    if thinking_ephemeral is not None and ephemeral != thinking_ephemeral:
+        # The first followup replaces the "thinking..." message and keeps its visibility, so drop it
+        # and send the reply as a new message that is public or private as the handler asked
+        try:
+            await interaction.delete_original_response()
+        except discord.HTTPException:
+            pass
+    message = await interaction.followup.send(content, wait=True, ephemeral=ephemeral, **kwargs)
+    if delete_after is not None:
+        await message.delete(delay=delete_after)
+    return RerouteResponse(interaction, discord.InteractionResponseType.channel_message, message, ephemeral)
+
+
+async def _edit_original(interaction: discord.Interaction, *, delete_after=None, suppress_embeds=None, **kwargs):
+    message = await interaction.edit_original_response(**kwargs)
+    if delete_after is not None:
+        await message.delete(delay=delete_after)
+    return RerouteResponse(interaction, discord.InteractionResponseType.message_update, message)
+
+
+async def _already_deferred(interaction: discord.Interaction, *args, **kwargs):
+    return None
+
+
+# Where each response call goes once the guard has deferred the interaction
+_REROUTES = {
+    "send_message": _send_as_followup,
+    "edit_message": _edit_original,
+    "defer": _already_deferred,
+}
+
+
+def _wrap_response(name: str, original):
+    @functools.wraps(original)
+    async def respond(self, *args, **kwargs):
+        handler = _watched.get(self._parent.id)
+        if name == "send_message" and handler is not None:
+            # Remembered so the next slow run of the handler is deferred with the same visibility
+            _replied_ephemerally[handler] = bool(kwargs.get("ephemeral", False))
+        deferral = _deferrals.get(self._parent.id)
+        if deferral is None or not await deferral:
+            return await original(self, *args, **kwargs)
+        return await _REROUTES[name](self._parent, *args, **kwargs)
+    return respond
+
+
+def install():
+    """
+    Hook the guard into every interaction handler timed by metrics (call after metrics.instrument()).
+    Once an interaction was deferred, send_message goes out as a followup and edit_message
+    edits the original response instead, so handlers don't need to know the guard stepped in.
+    Both then return a RerouteResponse, which has the message_id and resource callers read from
+    the InteractionCallbackResponse; defer returns None. The "thinking..." message is ephemeral when
+    the handler's previous reply was (or its command's extras say so); a reply whose ephemeral flag
+    still differs replaces that message instead of inheriting its visibility.
+    """
+    if _originals:
+        return
+    for name in _REROUTES:
+        _originals[name] = getattr(discord.InteractionResponse, name)
+        setattr(discord.InteractionResponse, name, _wrap_response(name, _originals[name]))
+    metrics.handler_hooks.append(guard)
+
+
+def summary() -> str:
+    if not auto_deferred:
+        return "Deferral guard: no handler needed it."
+    worst = ", ".join(f"{handler} ({count})" for handler, count in auto_deferred.most_common(10))
+    return f"Deferral guard stepped in for: {worst}"
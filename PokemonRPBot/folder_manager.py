@@ -10,15 +10,16 @@ def ensure_guild_folder(guild):
     os.makedirs(guild_folder, exist_ok=True)  # Create guild folder if it doesn't exist
     print(f"Ensured folder for guild: {guild.name} (ID: {guild.id})")
 
-async def setup_folders(bot):
-    """Sets up folders for all guilds the bot is currently in at startup."""
+async def setup_folders(bot, shard_id=None):
+    """Sets up folders for all guilds the bot is currently in at startup, or only those of one shard."""
     # Ensure the root folder exists
     os.makedirs(ROOT_FOLDER, exist_ok=True)
     
     # Create a folder for each guild the bot is in
     for guild in bot.guilds:
-        ensure_guild_folder(guild)
-    print("All guild folders have been set up.")
+        if shard_id is None or guild.shard_id == shard_id:
+            ensure_guild_folder(guild)
+    print("All guild folders have been set up." if shard_id is None else f"Guild folders for shard {shard_id} have been set up.")
 
 # Event handler for joining a new guild
 async def on_guild_join(guild):
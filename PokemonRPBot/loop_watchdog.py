@@ -0,0 +1,148 @@
+import asyncio
+import os
+import sys
+import threading
+import time
+import traceback
+
+import config
+import metrics
+
+REPORT_FILE = "loop_stalls.txt"
+# How often the heartbeat coroutine ticks and the watchdog thread looks at it
+HEARTBEAT_INTERVAL = 0.05
+# Stack frames kept per call site in the report
+STACK_DEPTH = 12
+
+# Frames from files under this directory count as "ours"
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+def is_project_file(filename: str) -> bool:
+    if filename.startswith("<"):
+        # <frozen importlib._bootstrap>, <string>, ...
+        return False
+    filename = os.path.abspath(filename)
+    return filename.startswith(PROJECT_ROOT) and "site-packages" not in filename
+
+
+def project_frames(frame) -> list[traceback.FrameSummary]:
+    """The frames of a stack (outermost first) that belong to this codebase."""
+    return [entry for entry in traceback.extract_stack(frame) if is_project_file(entry.filename)]
+
+
+def call_site(entry: traceback.FrameSummary) -> str:
+    return f"{os.path.relpath(entry.filename, PROJECT_ROOT)}:{entry.lineno} in {entry.name}"
+
+
+class CallSiteStats:
+    def __init__(self, stack: list[str]):
+        self.stalls = 0
+        self.samples = 0
+        self.longest = 0.0
+        self.stack = stack
+
+
+class LoopWatchdog:
+    """
+    A heartbeat coroutine stamps the time on every tick; a separate thread notices when
+    the stamp goes stale (the loop is blocked) and captures what the loop thread is running.
+    Stalls are aggregated by the innermost project frame, i.e. the line of our code that blocked.
+    """
+
+    def __init__(self, threshold: float):
+        self.threshold = threshold
+        self.sites = {}
+        self.lock = threading.Lock()
+        self.last_beat = time.monotonic()
+        self.loop_thread_id = None
+        self.stopped = threading.Event()
+        self.heartbeat_task = None
+        self.thread = None
+        # Call site of the stall in progress, so it is only counted once
+        self.current_site = None
+
+    def start(self):
+        self.loop_thread_id = threading.get_ident()
+        self.last_beat = time.monotonic()
+        self.heartbeat_task = asyncio.create_task(self.heartbeat())
+        self.thread = threading.Thread(target=self.watch, name="loop-watchdog", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stopped.set()
+        if self.heartbeat_task is not None:
+            self.heartbeat_task.cancel()
+
+    async def heartbeat(self):
+        while True:
+            previous = self.last_beat
+            await asyncio.sleep(HEARTBEAT_INTERVAL)
+            now = time.monotonic()
+            self.last_beat = now
+            stall = now - previous - HEARTBEAT_INTERVAL
+            if stall >= self.threshold:
+                metrics.registry.inc("bot_event_loop_stalls_total")
+                metrics.registry.observe("bot_event_loop_stall_seconds", stall)
+                with self.lock:
+                    site = self.sites.get(self.current_site)
+                    if site is not None:
+                        site.longest = max(site.longest, stall)
+                    self.current_site = None
+
+    def watch(self):
+        """Watchdog thread: sample the loop thread's stack while the heartbeat is overdue."""
+        while not self.stopped.wait(HEARTBEAT_INTERVAL):
+            if time.monotonic() - self.last_beat < self.threshold + HEARTBEAT_INTERVAL:
+                continue
+            frame = sys._current_frames().get(self.loop_thread_id)
+            if frame is None:
+                continue
+            frames = project_frames(frame)
+            del frame
+            self.record(frames)
+
+    def record(self, frames: list[traceback.FrameSummary]):
+        key = call_site(frames[-1]) if frames else "<outside project code>"
+        with self.lock:
+            site = self.sites.get(key)
+            if site is None:
+                site = self.sites[key] = CallSiteStats([call_site(entry) for entry in frames[-STACK_DEPTH:]])
+            if self.current_site != key:
+                site.stalls += 1
+                self.current_site = key
+            site.samples += 1
+
+    def build_report(self) -> str:
+        with self.lock:
+            sites = sorted(self.sites.items(), key=lambda item: item[1].samples, reverse=True)
+        lines = [
+            f"Event loop stalls over {self.threshold}s, by call site (blocked time is sampled every {HEARTBEAT_INTERVAL}s)",
+        ]
+        if not sites:
+            lines.append("No stalls recorded.")
+        for key, site in sites:
+            lines.append("")
+            lines.append(f"{key}")
+            lines.append(f"  stalls={site.stalls} blocked~{site.samples * HEARTBEAT_INTERVAL:.2f}s longest={site.longest:.2f}s")
+            for entry in site.stack:
+                lines.append(f"    {entry}")
+        return "\n".join(lines) + "\n"
+
+    def write_report(self, path: str = REPORT_FILE):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self.build_report())
+
+
+# The running watchdog, if config.LOOP_WATCHDOG is on
+watchdog = None
+
+
+def start():
+    """Start the watchdog on the running loop when it is enabled in config."""
+    global watchdog
+    if not config.LOOP_WATCHDOG or watchdog is not None:
+        return
+    watchdog = LoopWatchdog(config.LOOP_STALL_THRESHOLD)
+    watchdog.start()
+    print(f"Loop watchdog started (threshold {config.LOOP_STALL_THRESHOLD}s)")
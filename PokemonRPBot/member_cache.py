@@ -0,0 +1,97 @@
+import time
+from collections import OrderedDict
+
+import discord
+
+import config
+import metrics
+
+# Members looked up with fetch_member, kept outside the guild caches
+FETCHED_MEMBERS = 1000
+# Seconds a fetched member (and so its roles) is trusted before it is fetched again
+FETCHED_MEMBER_TTL = 300
+
+# Seconds a role's member list fetched under the lazy policy is reused
+ROLE_MEMBERS_TTL = 300
+
+# (guild id, user id) -> (fetched at, member)
+_fetched = OrderedDict()
+# (guild id, role id) -> (fetched at, members with the role)
+_role_members = {}
+
+
+def is_lazy() -> bool:
+    return config.MEMBER_CACHE == "lazy"
+
+
+def bot_options() -> dict:
+    """Bot constructor options for the configured policy."""
+    if not is_lazy():
+        return {}
+    # Only the bot's own member stays cached; everyone else is looked up through the API when needed
+    return {"chunk_guilds_at_startup": False, "member_cache_flags": discord.MemberCacheFlags.none()}
+
+
+async def role_members(guild: discord.Guild, role_id: int) -> list:
+    """
+    Members with the role. Under the lazy policy they come from listing the guild through the API,
+    reused for ROLE_MEMBERS_TTL seconds, so a burst of commands lists it only once.
+    """
+    if not is_lazy():
+        role = guild.get_role(role_id)
+        return role.members if role is not None else []
+    key = (guild.id, role_id)
+    cached = _role_members.get(key)
+    if cached is not None and time.monotonic() - cached[0] < ROLE_MEMBERS_TTL:
+        metrics.cache_lookup("role_members", True)
+        return cached[1]
+    metrics.cache_lookup("role_members", False)
+    found = [member async for member in guild.fetch_members(limit=None) if member.get_role(role_id) is not None]
+    _role_members[key] = (time.monotonic(), found)
+    return found
+
+
+async def get_member(guild: discord.Guild, user_id: int):
+    """A member from the cache, else from the API (kept for FETCHED_MEMBER_TTL); None if not in the guild."""
+    member = guild.get_member(user_id)
+    if member is not None:
+        metrics.cache_lookup("members", True)
+        return member
+    key = (guild.id, user_id)
+    cached = _fetched.get(key)
+    if cached is not None and time.monotonic() - cached[0] < FETCHED_MEMBER_TTL:
+        _fetched.move_to_end(key)
+        metrics.cache_lookup("members", True)
+        return cached[1]
+    metrics.cache_lookup("members", False)
+    try:
+        member = await guild.fetch_member(user_id)
+    except discord.NotFound:
+        return None
+    _fetched[key] = (time.monotonic(), member)
+    _fetched.move_to_end(key)
+    while len(_fetched) > FETCHED_MEMBERS:
+        _fetched.popitem(last=False)
+    return member
+
+
+async def search(guild: discord.Guild, query: str, limit: int = 25) -> list:
+    """
+    Members whose display name contains the query, for autocompletes. Under the lazy policy the guild
+    is searched by name prefix through the gateway instead, since its members aren't cached.
+    """
+    if is_lazy():
+        return await guild.query_members(query, limit=min(limit, 100), cache=False)
+
+    query = query.lower()
+    found = []
+    for member in guild.members:
+        if query in member.display_name.lower():
+            found.append(member)
+            if len(found) >= limit:
+                break
+    return found
+
+
+def summary() -> str:
+    return f"Member cache: {config.MEMBER_CACHE}, {len(_fetched)} fetched members, {len(_role_members)} fetched role lists"
@@ -0,0 +1,116 @@
+import os
+import sysconfig
+import tracemalloc
+from collections import Counter
+
+from loop_watchdog import PROJECT_ROOT, is_project_file
+
+REPORT_FILE = "memory_report.txt"
+# Frames kept per allocation; enough to walk from csv/json internals back up to our own code
+TRACE_FRAMES = 10
+TOP_ENTRIES = 15
+
+STDLIB_DIR = os.path.abspath(sysconfig.get_paths()["stdlib"])
+# discord.py modules whose allocations are mostly the member/user cache (intents.members)
+MEMBER_CACHE_MODULES = ("member.py", "user.py", "guild.py", "state.py")
+
+# Totals per subsystem and per call site at the time of the baseline
+_baseline = None
+
+
+def start():
+    """Trace allocations from here on; call before the heavy imports so they are attributed too."""
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(TRACE_FRAMES)
+
+
+def subsystem(filename: str) -> str:
+    """Name of the part of the bot (or library) a source file belongs to."""
+    if filename.startswith("<frozen importlib"):
+        return "imports"
+    if is_project_file(filename):
+        return os.path.relpath(os.path.abspath(filename), PROJECT_ROOT).replace(os.sep, "/")
+    filename = os.path.abspath(filename)
+    parts = filename.replace(os.sep, "/").split("/site-packages/", 1)
+    if len(parts) == 2:
+        package = parts[1].split("/", 1)[0]
+        if package == "discord" and os.path.basename(filename) in MEMBER_CACHE_MODULES:
+            return "discord.py member cache"
+        return package
+    if filename.startswith(STDLIB_DIR):
+        return "stdlib"
+    return "other"
+
+
+def group(snapshot: tracemalloc.Snapshot) -> tuple[Counter, Counter]:
+    """
+    Totals by subsystem and by project call site.
+    An allocation belongs to the innermost frame of our own code on its traceback, so a dict
+    built by csv.DictReader for data_loader counts as data_loader.py; allocations with no
+    project frame fall back to the library that made them.
+    """
+    by_subsystem = Counter()
+    by_site = Counter()
+    for stat in snapshot.statistics("traceback"):
+        frames = stat.traceback  # oldest call first
+        owner = next((frame for frame in reversed(frames) if is_project_file(frame.filename)), None)
+        if owner is None:
+            by_subsystem[subsystem(frames[-1].filename)] += stat.size
+            continue
+        by_subsystem[subsystem(owner.filename)] += stat.size
+        by_site[f"{subsystem(owner.filename)}:{owner.lineno}"] += stat.size
+    return by_subsystem, by_site
+
+
+def take() -> tuple[Counter, Counter]:
+    # Leave out the bookkeeping of tracemalloc and of this module (the stored baseline)
+    snapshot = tracemalloc.take_snapshot().filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, __file__),
+    ))
+    return group(snapshot)
+
+
+def set_baseline():
+    """Remember the current totals; later reports show growth relative to this point."""
+    global _baseline
+    _baseline = take()
+
+
+def format_size(size: float) -> str:
+    sign = "-" if size < 0 else ""
+    size = abs(size)
+    for unit in ("B", "KiB", "MiB"):
+        if size < 1024:
+            return f"{sign}{size:.0f} {unit}"
+        size /= 1024
+    return f"{sign}{size:.1f} GiB"
+
+
+def _section(title: str, current: Counter, baseline: Counter) -> list[str]:
+    keys = set(current) | set(baseline)
+    growth = sorted(keys, key=lambda key: current[key] - baseline[key], reverse=True)
+    lines = ["", f"== {title} (largest growth first) =="]
+    for key in growth[:TOP_ENTRIES]:
+        lines.append(f"{format_size(current[key]):>11}  {format_size(current[key] - baseline[key]):>11}  {key}")
+    return lines
+
+
+def build_report(extra: list[str] = None) -> str:
+    """Current totals and growth since the baseline; must be called while tracing."""
+    by_subsystem, by_site = take()
+    base_subsystem, base_site = _baseline or (Counter(), Counter())
+    current, peak = tracemalloc.get_traced_memory()
+    lines = [
+        f"Traced memory: {format_size(current)} (peak {format_size(peak)})",
+        "Columns: current size, growth since baseline" + ("" if _baseline else " (no baseline yet)"),
+    ]
+    lines += extra or []
+    lines += _section("By subsystem", by_subsystem, base_subsystem)
+    lines += _section("By call site in our code", by_site, base_site)
+    return "\n".join(lines) + "\n"
+
+
+def write_report(text: str, path: str = REPORT_FILE):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
@@ -0,0 +1,62 @@
+import re
+import traceback
+
+# Flags a pattern can carry into the combined regex as an inline group, e.g. (?i:...)
+INLINE_FLAGS = ((re.IGNORECASE, "i"), (re.MULTILINE, "m"), (re.DOTALL, "s"), (re.VERBOSE, "x"), (re.ASCII, "a"))
+
+
+def scoped(pattern: re.Pattern) -> str:
+    """The pattern's source wrapped in a group that keeps its flags when joined with other patterns."""
+    flags = "".join(letter for flag, letter in INLINE_FLAGS if pattern.flags & flag)
+    # A verbose pattern may end in a comment, which would swallow the closing parenthesis
+    end = "\n)" if pattern.flags & re.VERBOSE else ")"
+    return f"(?{flags}:{pattern.pattern}{end}"
+
+
+class MessagePipeline:
+    """
+    Single on_message entry point for pattern-triggered listeners.
+    All registered patterns are merged into one precompiled regex, so a message that
+    matches none of them is rejected with a single search. Each pattern keeps its own flags.
+    """
+
+    def __init__(self):
+        self.listeners = {}  # name -> (compiled pattern, async handler(message, match))
+        self.combined = None
+
+    def register(self, name: str, pattern: re.Pattern, handler):
+        """Register (or replace) a listener that runs when 'pattern' matches a message."""
+        self.listeners[name] = (pattern, handler)
+        self._rebuild()
+
+    def unregister(self, name: str):
+        self.listeners.pop(name, None)
+        self._rebuild()
+
+    def _rebuild(self):
+        if not self.listeners:
+            self.combined = None
+            return
+        self.combined = re.compile("|".join(scoped(pattern) for pattern, _ in self.listeners.values()))
+
+    async def dispatch(self, message):
+        """Run every listener whose pattern matches the message content."""
+        if self.combined is None or message.author.bot:
+            return
+        content = message.content
+        if not self.combined.search(content):
+            return
+
+        for name, (pattern, handler) in list(self.listeners.items()):
+            match = pattern.search(content)
+            if not match:
+                continue
+            try:
+                await handler(message, match)
+            except Exception as e:
+                print(f"Message listener {name} failed: {e}")
+                traceback.print_exc()
+
+
+# Shared instance used by bot.py and the cogs that register listeners
+pipeline = MessagePipeline()
@@ -0,0 +1,31 @@
+from collections import OrderedDict
+
+# Guild reactions carry the message author, so only DMs need the registry. The oldest IDs are
+# dropped past this many; reactions to those DMs are ignored like before the bot tracked any
+MAX_MESSAGES = 10_000
+
+
+class MessageRegistry:
+    """IDs of the DMs the bot sent recently, so ❌ reactions there can be checked without fetching the message."""
+
+    def __init__(self, size: int = MAX_MESSAGES):
+        self.size = size
+        self.ids = OrderedDict()  # oldest first
+
+    def __contains__(self, message_id: int) -> bool:
+        return message_id in self.ids
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def add(self, message_id: int):
+        self.ids[message_id] = None
+        while len(self.ids) > self.size:
+            self.ids.popitem(last=False)
+
+    def discard(self, message_id: int):
+        self.ids.pop(message_id, None)
+
+
+# Shared registry used by the whole bot
+registry = MessageRegistry()
@@ -0,0 +1,302 @@
+import asyncio
+import contextlib
+import functools
+import time
+from bisect import bisect_left
+
+import discord
+from discord import app_commands
+from discord.ui.view import BaseView, ViewStore
+
+import config
+
+# Upper bounds (seconds) of the latency histogram buckets; 3s is Discord's response deadline
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 3.0, 5.0, 10.0)
+# How often the event loop lag monitor wakes up
+LOOP_LAG_INTERVAL = 0.5
+# InteractionResponse methods that count as the first response to an interaction
+RESPONSE_METHODS = ("defer", "send_message", "edit_message", "send_modal", "autocomplete")
+
+
+class Histogram:
+    """Cumulative bucket counts plus sum and count, like a Prometheus histogram."""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-th observation (approximate)."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+
+class Registry:
+    """In-process store of counters, gauges and histograms, keyed by name and labels."""
+
+    def __init__(self):
+        self.counters = {}
+        self.gauges = {}
+        self.histograms = {}
+
+    def inc(self, name: str, amount: float = 1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        self.counters[key] = self.counters.get(key, 0) + amount
+
+    def set_gauge(self, name: str, value: float, **labels):
+        self.gauges[(name, tuple(sorted(labels.items())))] = value
+
+    def observe(self, name: str, value: float, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            histogram = self.histograms[key] = Histogram()
+        histogram.observe(value)
+
+    def render(self) -> str:
+        """Everything in the Prometheus text exposition format."""
+        lines = []
+        for kind, store in (("counter", self.counters), ("gauge", self.gauges)):
+            for name in sorted({name for name, _ in store}):
+                lines.append(f"# TYPE {name} {kind}")
+                for (metric, labels), value in store.items():
+                    if metric == name:
+                        lines.append(f"{name}{_format_labels(labels)} {value}")
+
+        for name in sorted({name for name, _ in self.histograms}):
+            lines.append(f"# TYPE {name} histogram")
+            for (metric, labels), histogram in self.histograms.items():
+                if metric != name:
+                    continue
+                cumulative = 0
+                for bound, count in zip(histogram.buckets + (float("inf"),), histogram.counts):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else str(bound)
+                    lines.append(f"{name}_bucket{_format_labels(labels + (('le', le),))} {cumulative}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {histogram.sum}")
+                lines.append(f"{name}_count{_format_labels(labels)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels) + "}"
+
+
+# Shared registry used by the whole bot
+registry = Registry()
+
+# interaction.id -> (kind, handler) for interactions whose handler is currently running
+_handlers = {}
+# Async context manager factories (interaction, kind, handler) entered around every handler, e.g. the deferral guard
+handler_hooks = []
+_server_runner = None
+_lag_task = None
+
+
+def cache_lookup(cache: str, hit: bool):
+    """Count one lookup in a named cache, so hit rates show up next to the latencies."""
+    registry.inc("bot_cache_requests_total", cache=cache, result="hit" if hit else "miss")
+
+
+def _interaction_label(interaction: discord.Interaction):
+    known = _handlers.get(interaction.id)
+    if known is not None:
+        return known
+    if interaction.command is not None:
+        return "command", interaction.command.qualified_name
+    return "other", "unknown"
+
+
+async def _timed_handler(interaction: discord.Interaction, kind: str, handler: str, coro):
+    """Run one interaction handler, recording its duration and whether it raised."""
+    _handlers[interaction.id] = (kind, handler)
+    registry.inc("bot_interactions_total", kind=kind, handler=handler)
+    start = time.perf_counter()
+    try:
+        async with contextlib.AsyncExitStack() as stack:
+            for hook in handler_hooks:
+                await stack.enter_async_context(hook(interaction, kind, handler))
+            result = await coro
+        # The command tree reports its own errors through on_error and only flags the interaction
+        if kind == "command" and interaction.command_failed:
+            registry.inc("bot_interaction_errors_total", kind=kind, handler=handler)
+        return result
+    except Exception:
+        registry.inc("bot_interaction_errors_total", kind=kind, handler=handler)
+        raise
+    finally:
+        registry.observe("bot_interaction_duration_seconds", time.perf_counter() - start, kind=kind, handler=handler)
+        _handlers.pop(interaction.id, None)
+
+
+def _command_name(data) -> str:
+    """Qualified name (group, subcommand) of the command an interaction payload invokes."""
+    parts = [data.get("name", "unknown")]
+    options = data.get("options", [])
+    # Option types 1 and 2 are subcommands and subcommand groups
+    while options and options[0].get("type") in (1, 2):
+        parts.append(options[0]["name"])
+        options = options[0].get("options", [])
+    return " ".join(parts)
+
+
+def _item_name(view, item) -> str:
+    callback = getattr(item.callback, "callback", item.callback)
+    name = getattr(callback, "__name__", "callback")
+    if name == "callback":
+        name = type(item).__name__
+    return f"{type(view).__name__}.{name}"
+
+
+def _wrap_tree_call(original):
+    @functools.wraps(original)
+    async def _call(self, interaction):
+        data = interaction.data or {}
+        kind = "autocomplete" if interaction.type is discord.InteractionType.autocomplete else "command"
+        return await _timed_handler(interaction, kind, _command_name(data), original(self, interaction))
+    return _call
+
+
+def _wrap_view_task(original):
+    @functools.wraps(original)
+    async def _scheduled_task(self, item, interaction):
+        return await _timed_handler(interaction, "component", _item_name(self, item), original(self, item, interaction))
+    return _scheduled_task
+
+
+def _wrap_modal_task(original):
+    @functools.wraps(original)
+    async def _scheduled_task(self, interaction, *args):
+        return await _timed_handler(interaction, "modal", type(self).__name__, original(self, interaction, *args))
+    return _scheduled_task
+
+
+def _wrap_view_error(original):
+    # Exceptions in view callbacks never leave _scheduled_task, they end up here instead
+    @functools.wraps(original)
+    async def on_error(self, interaction, error, item):
+        registry.inc("bot_interaction_errors_total", kind="component", handler=_item_name(self, item))
+        return await original(self, interaction, error, item)
+    return on_error
+
+
+def _wrap_dynamic_call(original):
+    @functools.wraps(original)
+    async def schedule_dynamic_item_call(self, component_type, factory, interaction, custom_id, match):
+        return await _timed_handler(interaction, "component", factory.__name__,
+                                    original(self, component_type, factory, interaction, custom_id, match))
+    return schedule_dynamic_item_call
+
+
+def _wrap_response(original):
+    @functools.wraps(original)
+    async def respond(self, *args, **kwargs):
+        first = not self.is_done()
+        result = await original(self, *args, **kwargs)
+        if first:
+            interaction = self._parent
+            kind, handler = _interaction_label(interaction)
+            # Measured from Discord's own timestamp, since that is what the 3s deadline uses
+            elapsed = (discord.utils.utcnow() - interaction.created_at).total_seconds()
+            registry.observe("bot_interaction_first_response_seconds", max(elapsed, 0.0), kind=kind, handler=handler)
+        return result
+    return respond
+
+
+def instrument():
+    """Patch the interaction entry points (commands, autocomplete, views, modals, dynamic items) and responses."""
+    if getattr(app_commands.CommandTree._call, "__wrapped__", None) is not None:
+        return
+    app_commands.CommandTree._call = _wrap_tree_call(app_commands.CommandTree._call)
+    BaseView._scheduled_task = _wrap_view_task(BaseView._scheduled_task)
+    BaseView.on_error = _wrap_view_error(BaseView.on_error)
+    discord.ui.Modal._scheduled_task = _wrap_modal_task(discord.ui.Modal._scheduled_task)
+    ViewStore.schedule_dynamic_item_call = _wrap_dynamic_call(ViewStore.schedule_dynamic_item_call)
+    for name in RESPONSE_METHODS:
+        setattr(discord.InteractionResponse, name, _wrap_response(getattr(discord.InteractionResponse, name)))
+
+
+async def _monitor_loop_lag():
+    """Sleep for a fixed interval and record how late the loop woke us up."""
+    loop = asyncio.get_running_loop()
+    while True:
+        expected = loop.time() + LOOP_LAG_INTERVAL
+        await asyncio.sleep(LOOP_LAG_INTERVAL)
+        lag = max(loop.time() - expected, 0.0)
+        registry.observe("bot_event_loop_lag_seconds", lag)
+        registry.set_gauge("bot_event_loop_lag_last_seconds", lag)
+
+
+async def _handle_scrape(request):
+    from aiohttp import web
+    return web.Response(text=registry.render(), content_type="text/plain", charset="utf-8")
+
+
+async def start():
+    """Start the loop lag monitor and, if a port is configured, the localhost scrape endpoint."""
+    global _server_runner, _lag_task
+    if _lag_task is None:
+        _lag_task = asyncio.create_task(_monitor_loop_lag())
+
+    if config.METRICS_PORT is None or _server_runner is not None:
+        return
+    from aiohttp import web
+    app = web.Application()
+    app.router.add_get("/metrics", _handle_scrape)
+    _server_runner = web.AppRunner(app)
+    await _server_runner.setup()
+    await web.TCPSite(_server_runner, "127.0.0.1", config.METRICS_PORT).start()
+    print(f"Metrics available at http://127.0.0.1:{config.METRICS_PORT}/metrics")
+
+
+def summary(limit: int = 15) -> str:
+    """Short per-handler table for /debug stats, slowest p95 first."""
+    rows = []
+    for (name, labels), histogram in registry.histograms.items():
+        if name != "bot_interaction_duration_seconds":
+            continue
+        label_map = dict(labels)
+        first_response = registry.histograms.get(("bot_interaction_first_response_seconds", labels))
+        errors = registry.counters.get(("bot_interaction_errors_total", labels), 0)
+        rows.append((
+            histogram.quantile(0.95),
+            f"{label_map['kind'][:4]} {label_map['handler'][:28]:<28} n={histogram.count:<5} err={errors:<3} "
+            f"p50={histogram.quantile(0.5):<5} p95={histogram.quantile(0.95):<5} "
+            f"ttfr95={first_response.quantile(0.95) if first_response else '-'}"
+        ))
+    rows.sort(key=lambda row: row[0], reverse=True)
+
+    lines = [row for _, row in rows[:limit]] or ["No interactions recorded yet."]
+    lag = registry.histograms.get(("bot_event_loop_lag_seconds", ()))
+    if lag is not None:
+        lines.append(f"Event loop lag: p50={lag.quantile(0.5)}s p99={lag.quantile(0.99)}s "
+                     f"last={registry.gauges.get(('bot_event_loop_lag_last_seconds', ()), 0):.3f}s")
+    hits = {}
+    for (name, labels), value in registry.counters.items():
+        if name == "bot_cache_requests_total":
+            label_map = dict(labels)
+            hits.setdefault(label_map["cache"], {})[label_map["result"]] = value
+    for cache, results in hits.items():
+        total = results.get("hit", 0) + results.get("miss", 0)
+        lines.append(f"Cache {cache}: {results.get('hit', 0) / total:.0%} hit rate over {total:.0f} lookups")
+    return "\n".join(lines)
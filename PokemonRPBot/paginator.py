@@ -0,0 +1,187 @@
+import discord
+from collections import OrderedDict
+
+import metrics
+
+MAX_MESSAGE_LENGTH = 2000
+# How many laid-out page lists are kept around for lazy (re)rendering.
+PAGE_CACHE_SIZE = 128
+
+_page_cache = OrderedDict()
+
+
+def chunk_text(text: str, limit: int = MAX_MESSAGE_LENGTH) -> list[str]:
+    """
+    Splits 'text' into chunks of at most 'limit' characters each,
+    preserving all original spacing/newlines and attempting
+    not to break words. If a single word is longer than 'limit',
+    it will necessarily be broken mid-word.
+    """
+    chunks = []
+    i = 0
+    n = len(text)
+
+    while i < n:
+        # If the remaining text is short enough, just append it
+        if n - i <= limit:
+            chunks.append(text[i:])
+            break
+
+        end_index = i + limit
+        candidate_break = end_index
+        if not text[end_index - 1].isspace() and not text[end_index].isspace():
+            # Walk back from the limit to the nearest whitespace in this window only
+            pos = end_index - 1
+            while pos > i and not text[pos].isspace():
+                pos -= 1
+            if pos > i:
+                candidate_break = pos
+
+        chunks.append(text[i:candidate_break])
+        i = candidate_break
+
+        while i < n and text[i].isspace():
+            i += 1
+
+    return chunks
+
+
+class PageLayout:
+    """Pages laid out from (label, text) sections, plus the page each section starts on."""
+
+    def __init__(self, pages: list[str], section_pages: dict[str, int]):
+        self.pages = pages
+        self.section_pages = section_pages
+
+
+def layout_sections(header: str, sections: list[tuple[str, str]], limit: int = MAX_MESSAGE_LENGTH,
+                    separator: str = "\n\n") -> PageLayout:
+    """
+    Packs sections into as few pages as possible in a single pass.
+    Every page starts with 'header'; a section that does not fit on a page
+    of its own is split with chunk_text.
+    """
+    pages = []
+    section_pages = {}
+    current = header
+
+    for label, text in sections:
+        if not text:
+            continue
+        joiner = separator if current else ""
+        if len(current) + len(joiner) + len(text) <= limit:
+            section_pages[label] = len(pages)
+            current += joiner + text
+            continue
+
+        # Section doesn't fit here: close the current page and start a new one
+        if current != header:
+            pages.append(current)
+        section_pages[label] = len(pages)
+        room = limit - len(header) - len(separator) if header else limit
+        parts = chunk_text(text, room)
+        for part in parts[:-1]:
+            pages.append(header + separator + part if header else part)
+        current = header + separator + parts[-1] if header else parts[-1]
+
+    if current or not pages:
+        pages.append(current)
+    return PageLayout(pages, section_pages)
+
+
+def cached_layout(key: str, builder) -> PageLayout:
+    """Return the layout stored under 'key', building it with 'builder()' on first use."""
+    layout = _page_cache.get(key)
+    metrics.cache_lookup("paginator", layout is not None)
+    if layout is not None:
+        _page_cache.move_to_end(key)
+        return layout
+    layout = builder()
+    _page_cache[key] = layout
+    if len(_page_cache) > PAGE_CACHE_SIZE:
+        _page_cache.popitem(last=False)
+    return layout
+
+
+class SectionSelect(discord.ui.Select):
+    """Dropdown that jumps straight to the page a section starts on."""
+
+    def __init__(self, section_pages: dict[str, int]):
+        # Several sections can start on the same page and Discord rejects duplicate option values,
+        # so options are numbered and mapped back to their page
+        self.option_pages = list(section_pages.values())[:25]
+        options = [
+            discord.SelectOption(label=label[:100], value=str(index))
+            for index, label in enumerate(list(section_pages)[:25])
+        ]
+        super().__init__(placeholder="Jump to section", min_values=1, max_values=1, options=options, row=1)
+
+    async def callback(self, interaction: discord.Interaction):
+        await self.view.show_page(interaction, self.option_pages[int(self.values[0])])
+
+
+class PaginatedView(discord.ui.View):
+    """
+    One message, many pages: previous/next buttons and an optional section menu.
+    The layout is only built (or pulled from the cache) when it is first needed.
+    """
+
+    def __init__(self, layout_key: str, builder, author_id: int = None, timeout: float = 180):
+        super().__init__(timeout=timeout)
+        self.layout_key = layout_key
+        self.builder = builder
+        self.author_id = author_id
+        self.page = 0
+        layout = self.layout
+        if len(layout.section_pages) > 1:
+            self.add_item(SectionSelect(layout.section_pages))
+        self.update_buttons()
+
+    @property
+    def layout(self) -> PageLayout:
+        return cached_layout(self.layout_key, self.builder)
+
+    def update_buttons(self):
+        page_count = len(self.layout.pages)
+        self.previous_page.disabled = self.page <= 0
+        self.next_page.disabled = self.page >= page_count - 1
+        self.page_counter.label = f"{self.page + 1}/{page_count}"
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if self.author_id is not None and interaction.user.id != self.author_id:
+            await interaction.response.send_message("You did not invoke this command.", ephemeral=True)
+            return False
+        return True
+
+    async def show_page(self, interaction: discord.Interaction, page: int):
+        self.page = max(0, min(page, len(self.layout.pages) - 1))
+        self.update_buttons()
+        await interaction.response.edit_message(content=self.layout.pages[self.page], view=self)
+
+    @discord.ui.button(label="◀", style=discord.ButtonStyle.secondary, row=0)
+    async def previous_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self.show_page(interaction, self.page - 1)
+
+    @discord.ui.button(label="1/1", style=discord.ButtonStyle.secondary, row=0, disabled=True)
+    async def page_counter(self, interaction: discord.Interaction, button: discord.ui.Button):
+        pass
+
+    @discord.ui.button(label="▶", style=discord.ButtonStyle.secondary, row=0)
+    async def next_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self.show_page(interaction, self.page + 1)
+
+
+async def send_paginated(interaction: discord.Interaction, layout_key: str, builder,
+                         author_id: int = None, followup: bool = False, **kwargs):
+    """
+    Sends the first page of a layout as a single message.
+    Page controls are only attached when there is more than one page.
+    """
+    layout = cached_layout(layout_key, builder)
+    view = PaginatedView(layout_key, builder, author_id=author_id) if len(layout.pages) > 1 else None
+    if view is not None:
+        kwargs["view"] = view
+    if followup or interaction.response.is_done():
+        await interaction.followup.send(layout.pages[0], **kwargs)
+    else:
+        await interaction.response.send_message(layout.pages[0], **kwargs)
@@ -0,0 +1,356 @@
+import math
+import discord
+import os
+import json
+import re
+from functools import lru_cache
+
+from emojis import get_type_emoji
+import startup_profiler
+from paginator import PageLayout, cached_layout, layout_sections, send_paginated
+
+# ------------------------------
+# Evolution data & helpers
+# ------------------------------
+EVO_FILE = os.path.join(os.path.dirname(__file__), "Data", "pokemon_evolutions.json")
+
+@lru_cache(maxsize=None)
+def get_evolution_data() -> dict:
+    # Read on first use instead of at import time
+    try:
+        with startup_profiler.phase("data", f"{__name__} evolution data"), open(EVO_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception:
+        return {}
+
+def find_evolution_key(normalized: str, evo_data: dict) -> str:
+    target = normalized.replace("-", "")
+    for key in evo_data:
+        if normalize_name(key).replace("-", "") == target:
+            return key
+    return None
+
+def load_related_data(name: str) -> dict:
+    filename = find_movelist_filename(normalize_name(name))
+    if not filename:
+        return {}
+    with open(filename, "r", encoding="utf-8") as f:
+        return normalize_keys(json.load(f))
+
+def combine_moves(main_data: dict, related_names: list) -> dict:
+    """
+    Combine the main Pokémon's moves with those of pre-evolutions:
+      - For TM/Egg/Tutor and other non-rank categories, union and mark extras with '*'
+      - For badge ranks, merge in progression order and mark extras
+    """
+    combined = {}
+    moves_all = main_data.get("moves", {})
+    ranks = ["bronze", "silver", "gold", "platinum", "diamond"]
+
+    # 1) Non-rank categories: tm, egg, tutor, etc.
+    non_rank_cats = [cat for cat in moves_all if cat not in ranks]
+    for cat in non_rank_cats:
+        main_moves = set(moves_all.get(cat, []))
+        union = set(main_moves)
+        for rel in related_names:
+            union |= set(load_related_data(rel).get("moves", {}).get(cat, []))
+        merged = sorted(union, key=lambda m: m.lower())
+        # mark moves that come only from related forms
+        combined[cat] = [m if m in main_moves else f"{m}*" for m in merged]
+
+    # 2) Ranked categories: preserve progression order, avoid duplicates
+    seen = set()
+    for rank in ranks:
+        main_moves = set(moves_all.get(rank, []))
+        union = set(main_moves)
+        for rel in related_names:
+            union |= set(load_related_data(rel).get("moves", {}).get(rank, []))
+        new_moves = union - seen
+        merged = sorted(new_moves, key=lambda m: m.lower())
+        combined[rank] = [m if m in main_moves else f"{m}*" for m in merged]
+        seen |= union
+
+    return combined
+
+# ------------------------------
+# Helper functions & constants
+# ------------------------------
+
+def normalize_name(name: str) -> str:
+    normalized = name.lower()
+    normalized = re.sub(r'[^a-z0-9]', '-', normalized)
+    normalized = re.sub(r'-+', '-', normalized)
+    return normalized.strip('-')
+
+def normalize_keys(obj):
+    if isinstance(obj, dict):
+        return {k.lower(): normalize_keys(v) for k, v in obj.items()}
+    elif isinstance(obj, list):
+        return [normalize_keys(item) for item in obj]
+    else:
+        return obj
+
+def load_defensive_chart():
+    file_path = os.path.join(os.path.dirname(__file__), "Data", "typechart.json")
+    with open(file_path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+@lru_cache(maxsize=None)
+def get_defensive_chart() -> dict:
+    with startup_profiler.phase("data", f"{__name__} defensive chart"):
+        return load_defensive_chart()
+
+def normalize_type(t: str) -> str:
+    t_lower = t.lower()
+    for key in get_defensive_chart():
+        if key.lower() == t_lower:
+            return key
+    return t
+
+def get_effectiveness_category(multiplier: float) -> str:
+    if multiplier == 0:
+        return "Immune (No Damage)"
+    shift = round(math.log(multiplier, 2))
+    if shift == 0:
+        return "Neutral (0)"
+    elif shift == 1:
+        return "Effective (+1)"
+    elif shift == 2:
+        return "Super Effective (+2)"
+    elif shift == -1:
+        return "Ineffective (-1)"
+    elif shift == -2:
+        return "Super Ineffective (-2)"
+    elif shift > 2:
+        return f"Ultra Effective (+{shift})"
+    else:
+        return f"Ultra Ineffective ({shift})"
+
+def sort_key(category: str) -> float:
+    if category.startswith("Immune"):
+        return -999
+    m = re.search(r'\(([-+]\d+)\)', category)
+    return int(m.group(1)) if m else 0
+
+def find_movelist_filename(normalized: str, folder: str = os.path.join("data", "movelists")) -> str:
+    exact_path = os.path.join(folder, f"{normalized}.json")
+    if os.path.exists(exact_path):
+        return exact_path
+    target = normalized.replace("-", "")
+    for filename in os.listdir(folder):
+        if not filename.endswith(".json"):
+            continue
+        base = filename[:-5]
+        norm = normalize_name(base).replace("-", "")
+        if norm == target or norm in target or target in norm:
+            return os.path.join(folder, filename)
+    return None
+
+def format_stat_bar(stat: str) -> str:
+    try:
+        filled, total = map(int, stat.split('/'))
+        return "⬤" * filled + "⭘" * (total - filled)
+    except:
+        return stat
+
+def format_moves(moves_list: list) -> str:
+    return "  |  ".join(moves_list) if moves_list else "None"
+
+def load_ability(ability_name: str, folder: str = None) -> dict:
+    if folder is None:
+        folder = os.path.join(os.path.dirname(__file__), "Data", "abilities")
+    file_path = os.path.join(folder, f"{ability_name}.json")
+    if os.path.exists(file_path):
+        try:
+            with open(file_path, "r", encoding="utf-8") as f:
+                return normalize_keys(json.load(f))
+        except Exception:
+            pass
+    return None
+
+def build_learn_moves_layout(norm: str) -> PageLayout:
+    fn = find_movelist_filename(norm, "data/movelists")
+    if not fn:
+        return None
+
+    with open(fn, "r", encoding="utf-8") as f:
+        data = normalize_keys(json.load(f))
+
+    evo_data = get_evolution_data()
+    evo_key = find_evolution_key(norm, evo_data)
+    if evo_key:
+        data["moves"] = combine_moves(data, evo_data[evo_key])
+
+    header = f"### {data.get('name','Unknown')} [#{data.get('number','?')}]"
+    mv = data.get("moves", {})
+    sections = [
+        ("TM Moves", f":cd: **TM Moves**\n{format_moves(mv.get('tm', []))}"),
+        ("Egg Moves", f":egg: **Egg Moves**\n{format_moves(mv.get('egg', []))}"),
+        ("Tutor Moves", f":teacher: **Tutor Moves**\n{format_moves(mv.get('tutor', []))}"),
+    ]
+    return layout_sections(header, sections)
+
+# ------------------------------
+# Buttons
+# ------------------------------
+# The buttons are dynamic items: the Pokémon is read back from the custom_id when one is clicked, so
+# nothing is kept per posted message and buttons on old messages keep working after a restart.
+
+class PokemonAbilitiesButton(discord.ui.DynamicItem[discord.ui.Button], template=r"pokemon:abilities:(?P<norm>[a-z0-9-]+)"):
+    def __init__(self, normalized: str):
+        super().__init__(discord.ui.Button(label="Abilities", style=discord.ButtonStyle.primary,
+                                           custom_id=f"pokemon:abilities:{normalized}"))
+        self.normalized = normalized
+
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: discord.ui.Button, match):
+        return cls(match["norm"])
+
+    async def callback(self, interaction: discord.Interaction):
+        self.item.disabled = True
+        await interaction.response.edit_message(view=self.view)
+
+        fn = find_movelist_filename(self.normalized, "data/movelists")
+        if not fn:
+            return await interaction.followup.send("Could not find Pokémon data.")
+
+        with open(fn, "r", encoding="utf-8") as f:
+            data = normalize_keys(json.load(f))
+
+        msg = f"## {data.get('name','Unknown')} Abilities\n"
+        for a in data.get("abilities", {}).get("normal", []):
+            ad = load_ability(a)
+            if ad:
+                msg += f"\n### {a}\n{ad.get('effect','')}\n*{ad.get('description','')}*\n"
+            else:
+                msg += f"\n### {a}\nNo data found.\n"
+        for a in data.get("abilities", {}).get("hidden", []):
+            ad = load_ability(a)
+            if ad:
+                msg += f"\n### {a} (Hidden)\n{ad.get('effect','')}\n*{ad.get('description','')}*\n"
+            else:
+                msg += f"\n### {a} (Hidden)\nNo data found.\n"
+
+        await interaction.followup.send(msg)
+
+class PokemonTypeEffectivenessButton(discord.ui.DynamicItem[discord.ui.Button], template=r"pokemon:te:(?P<norm>[a-z0-9-]+)"):
+    def __init__(self, normalized: str):
+        super().__init__(discord.ui.Button(label="Type Effectiveness", style=discord.ButtonStyle.primary,
+                                           custom_id=f"pokemon:te:{normalized}"))
+        self.normalized = normalized
+
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: discord.ui.Button, match):
+        return cls(match["norm"])
+
+    async def callback(self, interaction: discord.Interaction):
+        self.item.disabled = True
+        await interaction.response.edit_message(view=self.view)
+
+        fn = find_movelist_filename(self.normalized, "data/movelists")
+        if not fn:
+            return await interaction.followup.send("Could not find Pokémon data.")
+
+        with open(fn, "r", encoding="utf-8") as f:
+            data = normalize_keys(json.load(f))
+
+        defender_types = [normalize_type(t) for t in data.get("types", [])]
+        chart = get_defensive_chart()
+        results = {}
+        for atk in chart:
+            m = 1.0
+            for dt in defender_types:
+                m *= chart[dt][atk]
+            if m == 1:
+                continue
+            cat = get_effectiveness_category(m)
+            if cat != "Neutral (0)":
+                results.setdefault(cat, []).append(atk)
+
+        msg = f"## Type Chart for {data.get('name','Unknown')}\n"
+        for cat in sorted(results, key=sort_key, reverse=True):
+            line = "  |  ".join(f"{get_type_emoji(t)} {t}" for t in results[cat])
+            msg += f"\n### {cat}\n{line}"
+
+        await interaction.followup.send(msg)
+
+class PokemonMovesButton(discord.ui.DynamicItem[discord.ui.Button], template=r"pokemon:moves:(?P<norm>[a-z0-9-]+)"):
+    def __init__(self, normalized: str):
+        super().__init__(discord.ui.Button(label="Moves", style=discord.ButtonStyle.primary,
+                                           custom_id=f"pokemon:moves:{normalized}"))
+        self.normalized = normalized
+
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: discord.ui.Button, match):
+        return cls(match["norm"])
+
+    async def callback(self, interaction: discord.Interaction):
+        self.item.disabled = True
+        await interaction.response.edit_message(view=self.view)
+
+        norm = self.normalized
+        fn = find_movelist_filename(norm, "data/movelists")
+        if not fn:
+            return await interaction.followup.send("Could not find Pokémon data.")
+
+        with open(fn, "r", encoding="utf-8") as f:
+            data = normalize_keys(json.load(f))
+
+        # --- evolution-based move merging ---
+        evo_data = get_evolution_data()
+        evo_key = find_evolution_key(norm, evo_data)
+        if evo_key:
+            data["moves"] = combine_moves(data, evo_data[evo_key])
+
+        header = f"### {data.get('name','Unknown')} [#{data.get('number','?')}]"
+        mv = data.get("moves", {})
+        sections = []
+        for icon, rank in [
+            ("<:badgebronze:1272532685197152349>", "bronze"),
+            ("<:badgesilver:1272533590697185391>", "silver"),
+            ("<:badgegold:1272532681992962068>", "gold"),
+            ("<:badgeplatinum:1272533593750507570>", "platinum"),
+        ]:
+            moves_text = format_moves(mv.get(rank, []))
+            if moves_text != "None":
+                sections.append(f"{icon} **{rank.title()}**\n{moves_text}")
+
+        msg = header
+        if sections:
+            msg += "\n\n" + "\n\n".join(sections)
+
+        view = discord.ui.View(timeout=None)
+        view.add_item(PokemonLearnMovesButton(norm))
+        await interaction.followup.send(msg, view=view)
+
+class PokemonLearnMovesButton(discord.ui.DynamicItem[discord.ui.Button], template=r"pokemon:learnmoves:(?P<norm>[a-z0-9-]+)"):
+    def __init__(self, normalized: str):
+        super().__init__(discord.ui.Button(label="Show all learnable Moves", style=discord.ButtonStyle.primary,
+                                           custom_id=f"pokemon:learnmoves:{normalized}"))
+        self.normalized = normalized
+
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: discord.ui.Button, match):
+        return cls(match["norm"])
+
+    async def callback(self, interaction: discord.Interaction):
+        self.item.disabled = True
+        await interaction.response.edit_message(view=self.view)
+
+        norm = self.normalized
+        layout_key = f"pokemon:learnmoves:{norm}"
+        if cached_layout(layout_key, lambda: build_learn_moves_layout(norm)) is None:
+            return await interaction.followup.send("Could not find Pokémon data.")
+
+        await send_paginated(interaction, layout_key, lambda: build_learn_moves_layout(norm), followup=True)
+
+# Registered once with bot.add_dynamic_items by the /stats and /pokemon cogs
+DYNAMIC_ITEMS = (PokemonAbilitiesButton, PokemonTypeEffectivenessButton, PokemonMovesButton, PokemonLearnMovesButton)
+
+def pokemon_view(normalized: str) -> discord.ui.View:
+    """The buttons under a stat card. Only dynamic items, so sending it doesn't keep the view around."""
+    view = discord.ui.View(timeout=None)
+    view.add_item(PokemonAbilitiesButton(normalized))
+    view.add_item(PokemonTypeEffectivenessButton(normalized))
+    view.add_item(PokemonMovesButton(normalized))
+    return view
@@ -0,0 +1,57 @@
+import asyncio
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+from loop_watchdog import PROJECT_ROOT, project_frames
+
+# Seconds between two stack samples (about 200 samples per second)
+SAMPLE_INTERVAL = 0.005
+MAX_SECONDS = 60
+
+# Only one capture may run at a time
+_capture_lock = asyncio.Lock()
+
+
+def frame_name(entry) -> str:
+    return f"{os.path.relpath(entry.filename, PROJECT_ROOT)}:{entry.name}"
+
+
+def sample_thread(thread_id: int, seconds: float) -> tuple[Counter, int]:
+    """
+    Samples one thread's stack until 'seconds' pass, keeping only this codebase's frames.
+    Returns collapsed stacks (outermost;...;innermost -> count) and the number of samples.
+    """
+    stacks = Counter()
+    samples = 0
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        frame = sys._current_frames().get(thread_id)
+        if frame is not None:
+            frames = project_frames(frame)
+            del frame
+            # Idle loop / library time still counts, so the proportions in the graph stay honest
+            stacks[";".join(frame_name(entry) for entry in frames) or "[outside project code]"] += 1
+            samples += 1
+        time.sleep(SAMPLE_INTERVAL)
+    return stacks, samples
+
+
+def collapse(stacks: Counter) -> str:
+    """Brendan Gregg's collapsed stack format, readable by flamegraph.pl and speedscope."""
+    return "".join(f"{stack} {count}\n" for stack, count in stacks.most_common())
+
+
+def is_running() -> bool:
+    return _capture_lock.locked()
+
+
+async def capture(seconds: float) -> tuple[str, int]:
+    """Profile the event loop thread for 'seconds' from a background thread, without stopping the bot."""
+    seconds = max(1, min(seconds, MAX_SECONDS))
+    loop_thread_id = threading.get_ident()
+    async with _capture_lock:
+        stacks, samples = await asyncio.to_thread(sample_thread, loop_thread_id, seconds)
+    return collapse(stacks), samples
@@ -0,0 +1,223 @@
+import asyncio
+import math
+import os
+from collections import defaultdict
+
+import discord
+from discord.ext import commands
+
+import config
+import metrics
+
+# Seconds between per-shard latency/guild samples
+SHARD_METRICS_INTERVAL = 15
+
+# Shards of this process that are connected and have received their guilds
+_ready_shards = set()
+# shard id -> event set while that shard is ready
+_shard_events = defaultdict(asyncio.Event)
+# Set once the first shard is ready; None until install() ran (e.g. cogs loaded by the benchmarks)
+_first_ready = None
+_metrics_task = None
+
+
+def create_bot(**options) -> commands.Bot:
+    """A commands.Bot, or an AutoShardedBot when config.SHARDING is on."""
+    if config.SHARDING:
+        return commands.AutoShardedBot(shard_count=config.SHARD_COUNT, shard_ids=config.SHARD_IDS, **options)
+    return commands.Bot(**options)
+
+
+def is_sharded(bot: commands.Bot) -> bool:
+    return isinstance(bot, discord.AutoShardedClient)
+
+
+def shard_for(bot: commands.Bot, guild_id) -> int:
+    """Shard that receives a guild's events; DMs (no guild) always arrive on shard 0."""
+    if guild_id is None or not bot.shard_count:
+        return 0
+    return (int(guild_id) >> 22) % bot.shard_count
+
+
+def runs_shard(bot: commands.Bot, shard_id: int) -> bool:
+    """Whether the shard is run by this process at all (with SHARD_IDS, other processes run the rest)."""
+    return not is_sharded(bot) or bot.shard_ids is None or shard_id in bot.shard_ids
+
+
+def owns_guild(bot: commands.Bot, guild_id) -> bool:
+    """Whether this process runs the guild's shard and that shard is ready, so its cache can be trusted."""
+    return shard_for(bot, guild_id) in _ready_shards
+
+
+def owns_channel(bot: commands.Bot, channel_id: int, guild_id=None) -> bool:
+    """
+    Like owns_guild, for records that only stored a channel (anything saved before they kept a guild_id).
+    The guild comes from the channel cache; an uncached channel counts as shard 0, like a DM.
+    """
+    if guild_id is None:
+        channel = bot.get_channel(channel_id)
+        guild_id = getattr(getattr(channel, "guild", None), "id", None)
+    return owns_guild(bot, guild_id)
+
+
+def store_paths(bot: commands.Bot, path: str) -> dict:
+    """
+    shard id -> file, for a JSON store whose records belong to their guild's shard. A process that runs
+    every shard keeps the one file (under None); shard workers keep one file per shard they run
+    (reminders.json -> reminders.shard3.json), so no two processes ever write the same file.
+    """
+    if not is_sharded(bot) or bot.shard_ids is None:
+        return {None: path}
+    root, ext = os.path.splitext(path)
+    return {shard_id: f"{root}.shard{shard_id}{ext}" for shard_id in bot.shard_ids}
+
+
+def split_records(bot: commands.Bot, records) -> dict:
+    """shard id -> that shard's part of records (a list, or a dict by id, of records with a guild_id)."""
+    parts = defaultdict(type(records))
+    if isinstance(records, dict):
+        for key, record in records.items():
+            parts[shard_for(bot, record.get("guild_id"))][key] = record
+    else:
+        for record in records:
+            parts[shard_for(bot, record.get("guild_id"))].append(record)
+    return parts
+
+
+def load_store(bot: commands.Bot, path: str, load):
+    """
+    The records of this process's shards, read with load(path). A shard file that doesn't exist yet
+    starts out with that shard's records from the shared file, e.g. on the first run as shard workers.
+    """
+    paths = store_paths(bot, path)
+    if None in paths:
+        return load(path)
+    shared = None
+    records = None
+    for shard_id, shard_path in paths.items():
+        if os.path.exists(shard_path):
+            part = load(shard_path)
+        else:
+            if shared is None:
+                shared = split_records(bot, load(path))
+            part = shared[shard_id]
+        if records is None:
+            records = part
+        elif isinstance(records, dict):
+            records.update(part)
+        else:
+            records.extend(part)
+    return records
+
+
+def save_store(bot: commands.Bot, path: str, records, save):
+    """Write records with save(records, path), split into this process's shard files when it has them."""
+    paths = store_paths(bot, path)
+    if None in paths:
+        save(records, path)
+        return
+    parts = split_records(bot, records)
+    for shard_id, shard_path in paths.items():
+        save(parts[shard_id], shard_path)
+
+
+async def wait_for_first_shard(bot: commands.Bot):
+    """For background loops: start as soon as any shard is ready instead of waiting for all of them."""
+    if _first_ready is None:
+        await bot.wait_until_ready()
+        return
+    await _first_ready.wait()
+
+
+async def wait_for_guild(bot: commands.Bot, guild_id) -> bool:
+    """Wait until the guild's shard is ready; False right away if another process runs that shard."""
+    if _first_ready is None:
+        await bot.wait_until_ready()
+        return True
+    # The shard count is only known once the first shard has connected
+    await _first_ready.wait()
+    shard_id = shard_for(bot, guild_id)
+    if not runs_shard(bot, shard_id):
+        return False
+    await _shard_events[shard_id].wait()
+    return True
+
+
+def _set_ready(shard_id: int, ready: bool):
+    if ready:
+        _ready_shards.add(shard_id)
+        _shard_events[shard_id].set()
+        _first_ready.set()
+    else:
+        _ready_shards.discard(shard_id)
+        _shard_events[shard_id].clear()
+    metrics.registry.set_gauge("bot_shard_ready", int(ready), shard=shard_id)
+
+
+def install(bot: commands.Bot):
+    """Track which shards are ready. A plain Bot counts as the single shard 0."""
+    global _first_ready
+    _first_ready = asyncio.Event()
+
+    if is_sharded(bot):
+        async def on_shard_ready(shard_id):
+            _set_ready(shard_id, True)
+
+        async def on_shard_resumed(shard_id):
+            _set_ready(shard_id, True)
+
+        async def on_shard_disconnect(shard_id):
+            _set_ready(shard_id, False)
+
+        bot.add_listener(on_shard_ready)
+        bot.add_listener(on_shard_resumed)
+        bot.add_listener(on_shard_disconnect)
+        return
+
+    async def on_ready():
+        _set_ready(0, True)
+
+    async def on_resumed():
+        _set_ready(0, True)
+
+    async def on_disconnect():
+        _set_ready(0, False)
+
+    bot.add_listener(on_ready)
+    bot.add_listener(on_resumed)
+    bot.add_listener(on_disconnect)
+
+
+def shard_stats(bot: commands.Bot) -> dict:
+    """shard id -> (heartbeat latency in seconds, guild count) for the shards this process runs."""
+    latencies = bot.latencies if is_sharded(bot) else [(0, bot.latency)]
+    guilds = defaultdict(int)
+    for guild in bot.guilds:
+        guilds[guild.shard_id or 0] += 1
+    return {shard_id: (latency, guilds[shard_id]) for shard_id, latency in latencies}
+
+
+async def _monitor_shards(bot: commands.Bot):
+    while True:
+        for shard_id, (latency, guilds) in shard_stats(bot).items():
+            # Latency is nan/inf until the shard's first heartbeat
+            if math.isfinite(latency):
+                metrics.registry.set_gauge("bot_shard_latency_seconds", latency, shard=shard_id)
+            metrics.registry.set_gauge("bot_shard_guilds", guilds, shard=shard_id)
+        await asyncio.sleep(SHARD_METRICS_INTERVAL)
+
+
+def start(bot: commands.Bot):
+    """Start sampling per-shard latency into the metrics."""
+    global _metrics_task
+    if _metrics_task is None:
+        _metrics_task = asyncio.create_task(_monitor_shards(bot))
+
+
+def summary(bot: commands.Bot) -> str:
+    rows = []
+    for shard_id, (latency, guilds) in sorted(shard_stats(bot).items()):
+        state = "ready" if shard_id in _ready_shards else "not ready"
+        ping = f"{latency * 1000:.0f}ms" if math.isfinite(latency) else "-"
+        rows.append(f"{shard_id}: {state}, {ping}, {guilds} guilds")
+    return "Shards: " + ("; ".join(rows) if rows else "none connected")
@@ -0,0 +1,137 @@
+import os
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+REPORT_FILE = "startup_profile.txt"
+# Set to 1 to profile a single start without touching config.PROFILE_STARTUP
+PROFILE_STARTUP_ENV = "POKEMONRPBOT_PROFILE_STARTUP"
+# How many of the slowest imports make it into the report
+TOP_IMPORTS = 40
+
+# Each record is (category, name, seconds, allocated bytes or None)
+records = []
+_import_hook = None
+# Whether tracemalloc was started here (and so should be stopped here), rather than by memory_report
+_owns_tracing = False
+_started_at = None
+_finished_at = None
+
+
+@contextmanager
+def phase(category: str, name: str):
+    """Record wall time and net allocated memory of the wrapped block."""
+    tracing = tracemalloc.is_tracing()
+    mem_before = tracemalloc.get_traced_memory()[0] if tracing else 0
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - start
+        allocated = tracemalloc.get_traced_memory()[0] - mem_before if tracing and tracemalloc.is_tracing() else None
+        records.append((category, name, seconds, allocated))
+
+
+class _TimedLoader:
+    """Wraps a module loader so executing the module is recorded as an import phase."""
+
+    def __init__(self, loader, fullname):
+        self._loader = loader
+        self._fullname = fullname
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        with phase("import", self._fullname):
+            self._loader.exec_module(module)
+
+    def __getattr__(self, name):
+        # Everything else (get_data, get_resource_reader, ...) goes to the real loader
+        return getattr(self._loader, name)
+
+
+class _ImportTimer:
+    """Meta path finder that delegates to the regular finders and times the loaders they return."""
+
+    def find_spec(self, fullname, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is None:
+                continue
+            if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                spec.loader = _TimedLoader(spec.loader, fullname)
+            return spec
+        return None
+
+
+def requested(configured: bool) -> bool:
+    """Whether to profile this start: config.PROFILE_STARTUP, or the environment variable."""
+    return configured or os.environ.get(PROFILE_STARTUP_ENV) == "1"
+
+
+def start():
+    """Begin profiling: time every import from now on and trace allocations."""
+    global _import_hook, _started_at, _owns_tracing
+    if _import_hook is not None:
+        return
+    _started_at = time.perf_counter()
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+        _owns_tracing = True
+    _import_hook = _ImportTimer()
+    sys.meta_path.insert(0, _import_hook)
+
+
+def finish():
+    """Stop the import hook (and allocation tracing, unless memory tracking uses it), then write the report."""
+    global _import_hook, _finished_at
+    if _import_hook is None:
+        return
+    sys.meta_path.remove(_import_hook)
+    _import_hook = None
+    _finished_at = time.perf_counter()
+    if _owns_tracing:
+        tracemalloc.stop()
+    write_report()
+
+
+def format_size(size) -> str:
+    if size is None:
+        return "-"
+    for unit in ("B", "KiB", "MiB"):
+        if abs(size) < 1024:
+            return f"{size:.0f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GiB"
+
+
+def build_report() -> str:
+    """Plain-text breakdown of the recorded phases, slowest first within each category."""
+    lines = ["Startup profile"]
+    if _started_at is not None and _finished_at is not None:
+        lines.append(f"Total startup time: {_finished_at - _started_at:.3f}s")
+    lines.append("Import times include nested imports; extensions load concurrently, so their times overlap.")
+
+    categories = []
+    for category, _, _, _ in records:
+        if category not in categories:
+            categories.append(category)
+
+    for category in categories:
+        entries = sorted((r for r in records if r[0] == category), key=lambda r: r[2], reverse=True)
+        if category == "import":
+            entries = entries[:TOP_IMPORTS]
+        lines.append("")
+        lines.append(f"== {category} ==")
+        for _, name, seconds, allocated in entries:
+            lines.append(f"{seconds * 1000:10.1f} ms  {format_size(allocated):>10}  {name}")
+    return "\n".join(lines) + "\n"
+
+
+def write_report(path: str = REPORT_FILE):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(build_report())
@@ -0,0 +1,95 @@
+import asyncio
+from collections import OrderedDict, defaultdict
+
+import discord
+
+import config
+import metrics
+
+# Live expiring views, oldest first
+_live = OrderedDict()
+# view class name -> live views of that class
+_counts = defaultdict(int)
+# Background expiries of evicted views, kept so they aren't garbage collected before they finish
+_expiring = set()
+
+
+def _set_gauge(view_class: str):
+    metrics.registry.set_gauge("bot_live_views", _counts[view_class], view=view_class)
+
+
+def _track(view: "ExpiringView"):
+    _live[view] = True
+    _counts[type(view).__name__] += 1
+    _set_gauge(type(view).__name__)
+    while len(_live) > config.MAX_ROLL_VIEWS:
+        oldest = next(iter(_live))
+        oldest.stop()
+        # Grey out its buttons in the background, the caller is still answering an interaction
+        task = asyncio.create_task(oldest.expire())
+        _expiring.add(task)
+        task.add_done_callback(_expiring.discard)
+
+
+def _message_id(response):
+    """
+    The sent message's id from whatever send_message returned: the callback response, or what the
+    deferral guard returned in its place (a callback-like response, or the followup message itself).
+    """
+    if isinstance(response, discord.Message):
+        return response.id
+    return getattr(response, "message_id", None) or getattr(getattr(response, "resource", None), "id", None)
+
+
+def _untrack(view: "ExpiringView"):
+    if _live.pop(view, None) is not None:
+        _counts[type(view).__name__] -= 1
+        _set_gauge(type(view).__name__)
+
+
+class ExpiringView(discord.ui.View):
+    """
+    A view whose buttons stop working after config.ROLL_VIEW_TIMEOUT seconds without a click, and are
+    greyed out on the message when they do. At most config.MAX_ROLL_VIEWS are alive at once; past that
+    the oldest expire early, so the views held in memory stay bounded however many rolls are made.
+    """
+
+    def __init__(self):
+        super().__init__(timeout=config.ROLL_VIEW_TIMEOUT)
+        self.message = None
+
+    async def send(self, interaction: discord.Interaction, **kwargs):
+        """Send the view as the interaction's response and start tracking it."""
+        response = await interaction.response.send_message(view=self, **kwargs)
+        message_id = _message_id(response)
+        if message_id is not None:
+            # Edited with the bot token later on, the interaction's token only lasts 15 minutes
+            channel = interaction.client.get_partial_messageable(interaction.channel_id)
+            self.message = channel.get_partial_message(message_id)
+        if not self.is_finished():
+            _track(self)
+
+    def stop(self):
+        _untrack(self)
+        super().stop()
+
+    async def expire(self, message: discord.Message = None):
+        """Stop listening and grey out the buttons on the message (the one the view was sent with by default)."""
+        self.stop()
+        for child in self.children:
+            child.disabled = True
+        message = message or self.message
+        if message is None:
+            return
+        try:
+            await message.edit(view=self)
+        except discord.HTTPException:
+            pass
+
+    async def on_timeout(self):
+        await self.expire()
+
+
+def summary() -> str:
+    counts = ", ".join(f"{name}: {count}" for name, count in sorted(_counts.items()) if count)
+    return f"Live roll views: {len(_live)}" + (f" ({counts})" if counts else "")